@@ -6,10 +6,11 @@ Enhancement Logger - 增强日志记录器
 注意：这是一个轻量级实现，基本日志功能已集成在 ErrorHandler 中
 """
 
+import atexit
 import sys
-from datetime import datetime
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence, Tuple
 
 
 class EnhancementLogger:
@@ -30,15 +31,40 @@ class EnhancementLogger:
         self.log_file = log_file
         self.verbose = verbose
         self.log_handle = None
+        # (秒级时间戳, 格式化结果)：同一秒内的消息复用同一个时间字符串
+        self._ts_cache: Tuple[int, str] = (-1, '')
         
         if log_file:
             Path(log_file).parent.mkdir(parents=True, exist_ok=True)
             self.log_handle = open(log_file, 'a', encoding='utf-8')
+            # __del__ 在解释器退出时不保证执行，注册退出钩子兜底，避免丢失文件缓冲中的日志
+            atexit.register(self.close)
+    
+    def __enter__(self):
+        """支持 with 语句"""
+        return self
+    
+    def __exit__(self, *exc_info):
+        """退出 with 块时关闭日志"""
+        self.close()
     
     def __del__(self):
         """清理资源"""
+        self.close()
+    
+    def close(self):
+        """写出缓冲内容并关闭日志文件，可重复调用"""
+        self.flush()
         if self.log_handle:
             self.log_handle.close()
+            self.log_handle = None
+            atexit.unregister(self.close)
+    
+    def flush(self):
+        """将控制台输出和日志文件的缓冲内容写出"""
+        sys.stdout.flush()
+        if self.log_handle:
+            self.log_handle.flush()
     
     def _write(self, message: str, to_console: bool = True):
         """
@@ -48,15 +74,31 @@ class EnhancementLogger:
             message: 日志消息
             to_console: 是否输出到控制台
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        formatted = f"[{timestamp}] {message}"
+        self._write_lines((message,), to_console)
+    
+    def _write_lines(self, messages: Sequence[str], to_console: bool = True):
+        """
+        写入一组日志（同一次记录调用的多行）
+        
+        控制台输出立即写出，但一组消息只调用一次 write，不跨调用缓冲，
+        进度信息与其他 stdout 输出保持原有顺序；日志文件依赖文件自身缓冲，
+        在周期结束或 flush() 时落盘
+        
+        Args:
+            messages: 日志消息
+            to_console: 是否输出到控制台
+        """
+        now = int(time.time())
+        if now != self._ts_cache[0]:
+            self._ts_cache = (now, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now)))
+        prefix = f"[{self._ts_cache[1]}] "
+        text = ''.join(prefix + message + '\n' for message in messages)
         
         if to_console:
-            print(formatted)
+            sys.stdout.write(text)
         
         if self.log_handle:
-            self.log_handle.write(formatted + '\n')
-            self.log_handle.flush()
+            self.log_handle.write(text)
     
     def log_cycle_start(self, document_type: str, document_path: str):
         """
@@ -66,10 +108,12 @@ class EnhancementLogger:
             document_type: 文档类型 (requirements/design/tasks)
             document_path: 文档路径
         """
-        self._write(f"\n{'='*60}")
-        self._write(f"Enhancement Cycle Started: {document_type.upper()}")
-        self._write(f"Document: {document_path}")
-        self._write(f"{'='*60}\n")
+        self._write_lines((
+            f"\n{'='*60}",
+            f"Enhancement Cycle Started: {document_type.upper()}",
+            f"Document: {document_path}",
+            f"{'='*60}\n",
+        ))
     
     def log_cycle_stop(self, document_type: str, initial_score: float, 
                        final_score: float, iterations: int, reason: str):
@@ -84,14 +128,17 @@ class EnhancementLogger:
             reason: 停止原因
         """
         improvement = final_score - initial_score
-        self._write(f"\n{'='*60}")
-        self._write(f"Enhancement Cycle Completed: {document_type.upper()}")
-        self._write(f"Initial Score: {initial_score:.2f}/10")
-        self._write(f"Final Score: {final_score:.2f}/10")
-        self._write(f"Improvement: +{improvement:.2f}")
-        self._write(f"Iterations: {iterations}")
-        self._write(f"Stopping Reason: {reason}")
-        self._write(f"{'='*60}\n")
+        self._write_lines((
+            f"\n{'='*60}",
+            f"Enhancement Cycle Completed: {document_type.upper()}",
+            f"Initial Score: {initial_score:.2f}/10",
+            f"Final Score: {final_score:.2f}/10",
+            f"Improvement: +{improvement:.2f}",
+            f"Iterations: {iterations}",
+            f"Stopping Reason: {reason}",
+            f"{'='*60}\n",
+        ))
+        self.flush()
     
     def log_iteration_start(self, iteration: int, current_score: float):
         """
@@ -101,8 +148,10 @@ class EnhancementLogger:
             iteration: 迭代编号
             current_score: 当前分数
         """
-        self._write(f"\n--- Iteration {iteration} ---")
-        self._write(f"Current Score: {current_score:.2f}/10")
+        self._write_lines((
+            f"\n--- Iteration {iteration} ---",
+            f"Current Score: {current_score:.2f}/10",
+        ))
     
     def log_iteration_complete(self, iteration: int, new_score: float, 
                                improvements_applied: int):
@@ -114,9 +163,11 @@ class EnhancementLogger:
             new_score: 新分数
             improvements_applied: 应用的改进数量
         """
-        self._write(f"Iteration {iteration} Complete:")
-        self._write(f"  New Score: {new_score:.2f}/10")
-        self._write(f"  Improvements Applied: {improvements_applied}")
+        self._write_lines((
+            f"Iteration {iteration} Complete:",
+            f"  New Score: {new_score:.2f}/10",
+            f"  Improvements Applied: {improvements_applied}",
+        ))
     
     def log_improvement_application(self, improvement_type: str, 
                                    section: str, success: bool):
@@ -142,6 +193,7 @@ class EnhancementLogger:
             error_message: 错误消息
         """
         self._write(f"ERROR: {error_message}", to_console=True)
+        self.flush()
     
     def log_warning(self, warning_message: str):
         """
@@ -6,10 +6,14 @@ Error Handler - 错误处理组件
 """
 
 import logging
+import sys
+import threading
 import traceback
+from collections import Counter, deque
+from itertools import islice
 from typing import Optional, Callable, Any
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 
 class ErrorSeverity(Enum):
@@ -20,15 +24,41 @@ class ErrorSeverity(Enum):
     INFO = "info"          # 信息
 
 
-@dataclass
+# slots=True 需要 Python 3.10+，旧版本退化为普通 dataclass
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# 错误日志消息模板
+_LOG_TEMPLATE = "[%s] %s failed: %s: %s"
+_LOG_TEMPLATE_WITH_DETAILS = _LOG_TEMPLATE + " | Details: %s"
+
+# 默认日志记录器的格式化器（所有 ErrorHandler 共享）
+_DEFAULT_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# 严重程度 -> (日志级别, 是否在 DEBUG 级别附带堆栈跟踪)
+_SEVERITY_LOG_LEVELS = {
+    ErrorSeverity.CRITICAL: (logging.CRITICAL, True),
+    ErrorSeverity.ERROR: (logging.ERROR, True),
+    ErrorSeverity.WARNING: (logging.WARNING, False),
+    ErrorSeverity.INFO: (logging.INFO, False),
+}
+
+# safe_execute 在历史中保留原始参数的严重程度（便于事后排查），其余级别只保留参数的 repr
+_RAW_ARGS_SEVERITIES = frozenset((ErrorSeverity.CRITICAL, ErrorSeverity.ERROR))
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ErrorContext:
-    """错误上下文"""
+    """错误上下文（历史中可能累积上千条，使用 slots 省去每个实例的 __dict__）"""
     operation: str
     component: str
     severity: ErrorSeverity
-    error: Exception
+    # 只有 handle_error 返回的上下文持有异常对象；错误历史中的记录为 None，
+    # 避免异常的 __traceback__ 连带持有各帧的局部变量
+    error: Optional[Exception]
     details: dict
-    stack_trace: str
+    stack_trace: Optional[str] = None  # 仅 CRITICAL/ERROR 记录
+    error_type: str = ''
+    error_msg: str = ''
 
 
 class ErrorHandler:
@@ -38,32 +68,40 @@ class ErrorHandler:
     提供错误捕获、日志记录和恢复机制
     """
     
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(self, logger: Optional[logging.Logger] = None, max_history: int = 1000):
         """
         初始化错误处理器
         
         Args:
             logger: 日志记录器，如果为 None 则创建默认记录器
+            max_history: 最多保留的错误数，超出后丢弃最早的记录
         """
         self.logger = logger or self._create_default_logger()
-        self.error_history = []
+        # 环形缓冲：长时间运行时内存有界；统计计数随记录的加入和淘汰增量维护
+        self.error_history = deque(maxlen=max_history)
+        self._severity_counts = Counter()
+        self._component_counts = Counter()
+        # 保护历史记录与统计计数的一致性（可能被多个工作线程同时调用）。
+        # 未竞争时加锁只有几十纳秒，而记录日志本身就要获取 handler 的锁，
+        # 按线程分缓冲区再合并并不能让 handle_error 真正无锁，只会增加复杂度
+        self._lock = threading.Lock()
     
-    def _create_default_logger(self) -> logging.Logger:
-        """创建默认日志记录器"""
+    @staticmethod
+    def _create_default_logger() -> logging.Logger:
+        """创建默认日志记录器（进程内只配置一次）"""
         logger = logging.getLogger('ultrawork')
+        # 'ultrawork' 记录器是进程级单例：每个 ErrorHandler 都再挂一个处理器会导致重复输出
+        if getattr(logger, '_ultrawork_configured', False):
+            return logger
         logger.setLevel(logging.INFO)
         
         # 控制台处理器
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
-        
-        # 格式化器
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(formatter)
+        console_handler.setFormatter(_DEFAULT_FORMATTER)
         
         logger.addHandler(console_handler)
+        logger._ultrawork_configured = True
         
         return logger
     
@@ -86,8 +124,12 @@ class ErrorHandler:
         Returns:
             ErrorContext: 错误上下文
         """
-        # 获取堆栈跟踪
-        stack_trace = traceback.format_exc()
+        # 堆栈跟踪在此刻立即格式化（之后异常可能被重新抛出，回溯会变化），
+        # 且只为日志会输出跟踪的严重程度（CRITICAL/ERROR）生成
+        _, with_trace = _SEVERITY_LOG_LEVELS.get(severity, (logging.INFO, False))
+        stack_trace = None
+        if with_trace:
+            stack_trace = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
         
         # 创建错误上下文
         context = ErrorContext(
@@ -96,38 +138,54 @@ class ErrorHandler:
             severity=severity,
             error=error,
             details=details or {},
-            stack_trace=stack_trace
+            stack_trace=stack_trace,
+            error_type=type(error).__name__,
+            error_msg=str(error)
         )
         
         # 记录错误
         self._log_error(context)
         
-        # 保存到历史
-        self.error_history.append(context)
+        # 保存到历史：只保留错误类型和消息，不持有异常对象本身（及其回溯中各帧的局部变量）；
+        # 调用方通过返回值拿到的上下文仍带有原始异常。
+        # 缓冲区已满时 append 会淘汰最左侧的记录，先扣除它的计数
+        record = replace(context, error=None)
+        with self._lock:
+            history = self.error_history
+            if history.maxlen is not None and len(history) == history.maxlen:
+                self._forget(history[0])
+            history.append(record)
+            self._severity_counts[severity.value] += 1
+            self._component_counts[component] += 1
         
         return context
     
+    def _forget(self, context: ErrorContext):
+        """从统计计数中扣除即将被淘汰的记录（调用方需持有 self._lock）"""
+        severity = context.severity.value
+        self._severity_counts[severity] -= 1
+        if not self._severity_counts[severity]:
+            del self._severity_counts[severity]
+        
+        component = context.component
+        self._component_counts[component] -= 1
+        if not self._component_counts[component]:
+            del self._component_counts[component]
+    
     def _log_error(self, context: ErrorContext):
         """记录错误到日志"""
-        message = (
-            f"[{context.component}] {context.operation} failed: "
-            f"{type(context.error).__name__}: {str(context.error)}"
-        )
+        # 根据严重程度选择日志级别（查表代替逐个比较枚举成员）
+        level, _ = _SEVERITY_LOG_LEVELS.get(context.severity, (logging.INFO, False))
         
+        # 使用 % 占位符延迟格式化：级别被过滤时不会执行 details 的 repr
+        args = (context.component, context.operation, context.error_type, context.error_msg)
         if context.details:
-            message += f" | Details: {context.details}"
-        
-        # 根据严重程度选择日志级别
-        if context.severity == ErrorSeverity.CRITICAL:
-            self.logger.critical(message)
-            self.logger.debug(context.stack_trace)
-        elif context.severity == ErrorSeverity.ERROR:
-            self.logger.error(message)
-            self.logger.debug(context.stack_trace)
-        elif context.severity == ErrorSeverity.WARNING:
-            self.logger.warning(message)
+            self.logger.log(level, _LOG_TEMPLATE_WITH_DETAILS, *args, context.details)
         else:
-            self.logger.info(message)
+            self.logger.log(level, _LOG_TEMPLATE, *args)
+        # 只有需要输出跟踪的严重程度才会在 handle_error 中生成 stack_trace
+        if context.stack_trace and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(context.stack_trace)
     
     def safe_execute(self,
                     operation: str,
@@ -159,13 +217,19 @@ class ErrorHandler:
             result = func(*args, **kwargs)
             return True, result
         except Exception as e:
+            # 传入原始参数，只在日志真正输出时才随 details 一起格式化
+            details = {'args': args, 'kwargs': kwargs}
             self.handle_error(
                 operation=operation,
                 component=component,
                 error=e,
                 severity=severity,
-                details={'args': str(args), 'kwargs': str(kwargs)}
+                details=details
             )
+            # 日志已输出：WARNING/INFO 的历史记录只保留参数的 repr，不再持有调用方的对象
+            if severity not in _RAW_ARGS_SEVERITIES:
+                details['args'] = repr(args)
+                details['kwargs'] = repr(kwargs)
             return False, default_return
     
     def get_error_summary(self) -> dict:
@@ -175,27 +239,26 @@ class ErrorHandler:
         Returns:
             dict: 错误统计信息
         """
+        with self._lock:
+            history = self.error_history
+            total = len(history)
+            by_severity = dict(self._severity_counts)
+            by_component = dict(self._component_counts)
+            recent = list(islice(history, max(0, total - 5), None))
+        
         summary = {
-            'total_errors': len(self.error_history),
-            'by_severity': {},
-            'by_component': {},
+            'total_errors': total,
+            'by_severity': by_severity,
+            'by_component': by_component,
             'recent_errors': []
         }
         
-        # 按严重程度统计
-        for context in self.error_history:
-            severity = context.severity.value
-            summary['by_severity'][severity] = summary['by_severity'].get(severity, 0) + 1
-            
-            component = context.component
-            summary['by_component'][component] = summary['by_component'].get(component, 0) + 1
-        
         # 最近的错误（最多5个）
-        for context in self.error_history[-5:]:
+        for context in recent:
             summary['recent_errors'].append({
                 'operation': context.operation,
                 'component': context.component,
-                'error': str(context.error),
+                'error': context.error_msg,
                 'severity': context.severity.value
             })
         
@@ -203,7 +266,10 @@ class ErrorHandler:
     
     def clear_history(self):
         """清空错误历史"""
-        self.error_history.clear()
+        with self._lock:
+            self.error_history.clear()
+            self._severity_counts.clear()
+            self._component_counts.clear()
 
 
 # 全局错误处理器实例
@@ -6,9 +6,58 @@ Improvement Identifier - 改进识别组件
 """
 
 import re
-from typing import List, Optional
-from dataclasses import dataclass
+import sys
+from collections import OrderedDict
+from types import MappingProxyType, SimpleNamespace
+from typing import Callable, List, Mapping, Optional, Pattern, Sequence, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
+from itertools import islice
+
+
+# 预编译的扫描模式（模块加载时编译一次，避免每次调用的编译/缓存查找）
+# EARS / 用户故事：有界的 [\s\S]{0,N} 间隔代替无界的 DOTALL 通配，避免在长文档上出现 O(n²) 回溯。
+# 间隔可以跨行（本仓库的用户故事和验收标准常分多行书写，如 "**As a** …\n**I want** …\n**So that** …"），
+# 但有上界，回溯只发生在固定大小的窗口内，标准库 re 已足够，无需引入 re2 等第三方引擎。
+# 这几个模式按 "### " 需求块逐块扫描（见 _count_per_block），匹配不会跨越不相关的需求块。
+# 各计数保持独立扫描，不要合并成一个带命名分组的交替模式：合并后失去字面量前缀的
+# 快速查找，实测反而更慢，且交替匹配互不重叠，会改变嵌套出现时的计数
+_EARS_ZH_RE = re.compile(r'(?:WHEN|当|如果)[\s\S]{0,400}?(?:THEN|那么|则)[\s\S]{0,400}?(?:SHALL|应该|必须)', re.IGNORECASE)
+_EARS_EN_RE = re.compile(r'(?:WHEN|IF|WHILE|WHERE)[\s\S]{0,400}?(?:THEN|THE\s+system\s+SHALL)', re.IGNORECASE)
+_USER_STORY_ZH_RE = re.compile(r'(?:作为|As a)[\s\S]{0,200}?(?:我希望|I want)[\s\S]{0,200}?(?:以便|So that)', re.IGNORECASE)
+_USER_STORY_EN_RE = re.compile(r'As an?[\s\S]{0,200}?I want[\s\S]{0,200}?So that', re.IGNORECASE)
+_BLOCK_SPLIT_RE = re.compile(r'\n(?=### )')
+_ACCEPTANCE_ZH_RE = re.compile(r'(?:\*\*验收标准\*\*:|Acceptance Criteria)', re.IGNORECASE)
+_ACCEPTANCE_EN_RE = re.compile(r'(?:Acceptance Criteria|#### Acceptance Criteria)', re.IGNORECASE)
+_NUMBERED_SECTION_RE = re.compile(r'### \d+\.\d+')
+_REQUIREMENT_HEADER_EN_RE = re.compile(r'### Requirement \d+', re.IGNORECASE)
+_MERMAID_RE = re.compile(r'```mermaid')
+_INTERFACE_RE = re.compile(r'(?:接口定义|Interface|API)', re.IGNORECASE)
+
+# 需求追溯扫描模式：字面量前缀 + 有界数字段，无嵌套量词，标准库 re 即为线性扫描
+# 两个计数保持各自的 findall：合并成带 (?P<bidir>Validates:...) 分组的单次 finditer
+# 计数可以做到一致，但实测反而更慢（逐个匹配回到 Python 层统计，且失去各自的前缀优化）
+_REQ_REF_RE = re.compile(r'(?:需求|Requirements?|Validates:)\s*\d+\.\d+', re.IGNORECASE)
+_BIDIR_REF_RE = re.compile(r'Validates:\s*Requirements?\s+\d+\.\d+', re.IGNORECASE)
+
+# 关键词清单（英文已预先小写，直接与小写副本做子串匹配）
+_NFR_KEYWORDS_ZH = ('性能', '安全', '可用性', '可维护性', '兼容性', '可扩展性')
+_NFR_KEYWORDS_EN = ('performance', 'security', 'usability', 'maintainability', 'scalability', 'reliability')
+_EDGE_CASE_KEYWORDS_ZH = ('边界', '极限', '最大', '最小', '空值', '异常')
+_EDGE_CASE_KEYWORDS_EN = ('boundary', 'edge case', 'limit', 'maximum', 'minimum', 'empty', 'null')
+_TECH_KEYWORDS_ZH = ('技术选型', '技术栈', '框架选择')
+_TECH_KEYWORDS_EN = ('technology', 'framework', 'stack')
+_NFR_DESIGN_KEYWORDS_ZH = ('性能设计', '安全设计', '可扩展性')
+_NFR_DESIGN_KEYWORDS_EN = ('performance', 'security', 'scalability')
+
+
+def _count_per_block(pattern: Pattern, blocks: List[str]) -> int:
+    """在每个需求块内分别计数后求和"""
+    return sum(len(pattern.findall(block)) for block in blocks)
+
+
+# 识别结果缓存的最大条目数（LRU 淘汰）
+_IDENTIFY_CACHE_SIZE = 128
 
 
 class ImprovementType(Enum):
@@ -33,412 +82,503 @@ class Priority(Enum):
     LOW = "low"
 
 
-@dataclass
+_EMPTY_METADATA = MappingProxyType({})
+
+# slots=True 需要 Python 3.10+，旧版本退化为普通 dataclass
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class Improvement:
-    """改进项"""
+    """改进项（不可变：无动态字段的改进项在多次识别之间共享同一实例）"""
     type: ImprovementType
     target_section: str
     description: str
     priority: Priority
     template: Optional[str] = None
-    metadata: dict = None
+    metadata: Mapping = field(default_factory=lambda: _EMPTY_METADATA)
+    
+    def __reduce__(self):
+        # MappingProxyType 不可 pickle（进程池批量识别需要回传结果），按普通 dict 传输
+        return (Improvement, (self.type, self.target_section, self.description,
+                              self.priority, self.template, dict(self.metadata)))
+
+
+@dataclass(frozen=True)
+class _Rule:
+    """
+    改进规则 - 条件成立时生成一条改进项
+    
+    check/metadata 接收识别阶段预先计算好的 facts 字典；
+    description 中的 {name} 占位符由 facts 填充
+    """
+    check: Callable[[dict], bool]
+    type: ImprovementType
+    target_section: str
+    description: str
+    priority: Priority
+    template: Optional[str] = None
+    metadata: Optional[Callable[[dict], dict]] = None
+    static: Optional[Improvement] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+        # 没有占位符和动态元数据的规则每次生成的改进项都相同，预先实例化一次
+        if self.metadata is None and '{' not in self.description:
+            object.__setattr__(self, 'static', self._build({}))
+    
+    def build(self, facts: dict) -> Improvement:
+        if self.static is not None:
+            return self.static
+        return self._build(facts)
+    
+    def _build(self, facts: dict) -> Improvement:
+        return Improvement(
+            type=self.type,
+            target_section=self.target_section,
+            description=self.description.format_map(facts),
+            priority=self.priority,
+            template=self.template,
+            metadata=self.metadata(facts) if self.metadata else _EMPTY_METADATA
+        )
+
+
+# ==================== Requirements 规则表 ====================
+# 规则顺序即改进项输出顺序，修改时请保持
+
+_REQ_RULES_ZH = (
+    # 检查基础结构
+    _Rule(lambda f: not f['has_intro'],
+          ImprovementType.ADD_SECTION, "概述",
+          "添加项目概述章节，包括项目背景和目标",
+          Priority.HIGH, "introduction_zh"),
+    _Rule(lambda f: not f['has_user_stories'],
+          ImprovementType.ADD_SECTION, "用户故事",
+          "添加用户故事章节，描述用户需求",
+          Priority.HIGH, "user_stories_zh"),
+    _Rule(lambda f: not f['has_functional'],
+          ImprovementType.ADD_SECTION, "功能需求",
+          "添加功能需求章节",
+          Priority.HIGH, "functional_requirements_zh"),
+    _Rule(lambda f: not f['has_nfr_section'],
+          ImprovementType.ADD_NFR, "非功能需求",
+          "添加非功能需求章节，包括性能、安全等",
+          Priority.MEDIUM, "nfr_section_zh"),
+    # 检查 EARS 格式
+    _Rule(lambda f: f['ears_count'] < 5,
+          ImprovementType.ENHANCE_CRITERIA, "验收标准",
+          "增加更多 EARS 格式的验收标准 (当前 {ears_count}，目标 5+)",
+          Priority.HIGH, "ears_criteria_zh",
+          lambda f: {'current_count': f['ears_count'], 'target_count': 5}),
+    # 检查用户故事格式
+    _Rule(lambda f: f['user_story_count'] < 3,
+          ImprovementType.ENHANCE_CRITERIA, "用户故事",
+          "完善用户故事格式 (当前 {user_story_count}，目标 3+)",
+          Priority.HIGH, "user_story_format_zh",
+          lambda f: {'current_count': f['user_story_count'], 'target_count': 3}),
+    # 检查验收标准完整性
+    _Rule(lambda f: 0 < f['requirements_count'] and f['acceptance_criteria'] < f['requirements_count'],
+          ImprovementType.ENHANCE_CRITERIA, "验收标准",
+          "为所有需求添加验收标准 ({acceptance_criteria}/{requirements_count})",
+          Priority.HIGH, None,
+          lambda f: {'current': f['acceptance_criteria'], 'total': f['requirements_count']}),
+    # 检查非功能需求覆盖
+    _Rule(lambda f: f['missing_nfr'] and f['has_nfr_section'],
+          ImprovementType.ADD_NFR, "非功能需求",
+          "补充非功能需求: {missing_nfr_text}",
+          Priority.MEDIUM, "nfr_items_zh",
+          lambda f: {'missing_nfr': f['missing_nfr']}),
+    # 检查错误处理需求
+    _Rule(lambda f: not f['has_error_handling'],
+          ImprovementType.ADD_ERROR_HANDLING, "功能需求",
+          "添加错误处理和异常情况需求",
+          Priority.MEDIUM, "error_handling_zh"),
+    # 检查边界条件
+    _Rule(lambda f: f['edge_case_count'] < 2,
+          ImprovementType.ADD_EDGE_CASES, "验收标准",
+          "添加边界条件和极限情况的验收标准",
+          Priority.MEDIUM, "edge_cases_zh"),
+    # 检查约束条件
+    _Rule(lambda f: not f['has_constraints'],
+          ImprovementType.ADD_SECTION, "约束条件",
+          "添加约束条件和限制说明",
+          Priority.LOW, "constraints_zh"),
+)
+
+_REQ_RULES_EN = (
+    # 检查基础结构
+    _Rule(lambda f: not f['has_intro'],
+          ImprovementType.ADD_SECTION, "Introduction",
+          "Add Introduction or Overview section with project background and goals",
+          Priority.HIGH, "introduction_en"),
+    _Rule(lambda f: not f['has_glossary'],
+          ImprovementType.ADD_GLOSSARY_TERM, "Glossary",
+          "Add Glossary section to define key terms",
+          Priority.MEDIUM, "glossary_en"),
+    _Rule(lambda f: not f['has_user_stories'],
+          ImprovementType.ADD_SECTION, "User Stories",
+          "Add User Stories section",
+          Priority.HIGH, "user_stories_en"),
+    _Rule(lambda f: not f['has_functional'],
+          ImprovementType.ADD_SECTION, "Requirements",
+          "Add Requirements or Functional Requirements section",
+          Priority.HIGH, "functional_requirements_en"),
+    # 检查 EARS 格式
+    _Rule(lambda f: f['ears_count'] < 5,
+          ImprovementType.ENHANCE_CRITERIA, "Acceptance Criteria",
+          "Add more EARS-format acceptance criteria (currently {ears_count}, target 5+)",
+          Priority.HIGH, "ears_criteria_en",
+          lambda f: {'current_count': f['ears_count'], 'target_count': 5}),
+    # 检查用户故事格式
+    _Rule(lambda f: f['user_story_count'] < 3,
+          ImprovementType.ENHANCE_CRITERIA, "User Stories",
+          "Add more user stories in 'As a...I want...So that' format (currently {user_story_count}, target 3+)",
+          Priority.HIGH, "user_story_format_en",
+          lambda f: {'current_count': f['user_story_count'], 'target_count': 3}),
+    # 检查验收标准完整性
+    _Rule(lambda f: 0 < f['requirements_count'] and f['acceptance_criteria'] < f['requirements_count'],
+          ImprovementType.ENHANCE_CRITERIA, "Acceptance Criteria",
+          "Add acceptance criteria for all requirements ({acceptance_criteria}/{requirements_count})",
+          Priority.HIGH, None,
+          lambda f: {'current': f['acceptance_criteria'], 'total': f['requirements_count']}),
+    # 检查非功能需求（只用到前 3 个缺失项）
+    _Rule(lambda f: len(f['missing_nfr']) == 3,
+          ImprovementType.ADD_NFR, "Non-functional Requirements",
+          "Add non-functional requirements: {missing_nfr_text}",
+          Priority.MEDIUM, "nfr_section_en",
+          lambda f: {'missing_nfr': f['missing_nfr']}),
+    # 检查错误处理需求
+    _Rule(lambda f: not f['has_error_handling'],
+          ImprovementType.ADD_ERROR_HANDLING, "Requirements",
+          "Add error handling and exception requirements",
+          Priority.MEDIUM, "error_handling_en"),
+    # 检查边界条件
+    _Rule(lambda f: f['edge_case_count'] < 2,
+          ImprovementType.ADD_EDGE_CASES, "Acceptance Criteria",
+          "Add boundary conditions and edge cases to acceptance criteria",
+          Priority.MEDIUM, "edge_cases_en"),
+    # 检查约束条件
+    _Rule(lambda f: not f['has_constraints'],
+          ImprovementType.ADD_SECTION, "Constraints",
+          "Add constraints and limitations section",
+          Priority.LOW, "constraints_en"),
+)
+
+
+# ==================== Design 规则表 ====================
+
+_DESIGN_RULES_ZH = (
+    # 检查基础结构
+    _Rule(lambda f: not f['has_overview'],
+          ImprovementType.ADD_SECTION, "系统概述",
+          "添加系统概述章节，包括设计目标和方法",
+          Priority.HIGH, "overview_zh"),
+    _Rule(lambda f: not f['has_architecture'],
+          ImprovementType.ADD_SECTION, "架构设计",
+          "添加架构设计章节，包括系统架构图",
+          Priority.HIGH, "architecture_zh"),
+    _Rule(lambda f: not f['has_components'],
+          ImprovementType.ADD_COMPONENT_DETAIL, "组件设计",
+          "添加组件设计章节，详细描述各组件",
+          Priority.HIGH, "components_zh"),
+    # 检查需求追溯
+    _Rule(lambda f: f['req_references'] < 3,
+          ImprovementType.ADD_TRACEABILITY, "全文",
+          "增加需求到设计的双向追溯 (当前 {req_references}，目标 5+)",
+          Priority.HIGH, "traceability_zh",
+          lambda f: {'current_count': f['req_references'], 'target_count': 5}),
+    _Rule(lambda f: f['bidirectional_refs'] == 0,
+          ImprovementType.ADD_TRACEABILITY, "组件设计",
+          "为设计元素添加 'Validates: Requirements X.Y' 注释",
+          Priority.HIGH, "validates_annotation"),
+    # 检查架构图
+    _Rule(lambda f: f['mermaid_count'] == 0,
+          ImprovementType.ADD_DIAGRAM, "架构设计",
+          "添加 Mermaid 架构图或设计图",
+          Priority.MEDIUM, "mermaid_diagram_zh"),
+    # 检查组件详细度
+    _Rule(lambda f: f['component_sections'] < 3,
+          ImprovementType.ADD_COMPONENT_DETAIL, "组件设计",
+          "增加更多组件描述 (当前 {component_sections}，建议 3+)",
+          Priority.MEDIUM, None,
+          lambda f: {'current_count': f['component_sections']}),
+    # 检查接口定义
+    _Rule(lambda f: f['interface_count'] < 2,
+          ImprovementType.ADD_COMPONENT_DETAIL, "组件设计",
+          "为组件添加接口定义和方法签名",
+          Priority.MEDIUM, "interface_definition"),
+    # 检查技术选型
+    _Rule(lambda f: not f['has_tech'],
+          ImprovementType.ADD_RATIONALE, "技术选型",
+          "补充技术选型说明和选型理由",
+          Priority.MEDIUM, "technology_stack_zh"),
+    # 检查错误处理策略
+    _Rule(lambda f: not f['has_error_handling'],
+          ImprovementType.ADD_SECTION, "错误处理",
+          "添加错误处理策略章节",
+          Priority.MEDIUM, "error_handling_design_zh"),
+    # 检查非功能需求设计
+    _Rule(lambda f: len(f['missing_nfr']) >= 2,
+          ImprovementType.ADD_COMPONENT_DETAIL, "非功能需求设计",
+          "补充非功能需求设计: {missing_nfr_text}",
+          Priority.MEDIUM, "nfr_design_zh",
+          lambda f: {'missing_nfr': f['missing_nfr']}),
+    # 检查正确性属性
+    _Rule(lambda f: not f['has_properties'],
+          ImprovementType.ADD_PROPERTIES, "正确性属性",
+          "添加正确性属性章节，用于属性测试",
+          Priority.LOW, "correctness_properties_zh"),
+)
+
+_DESIGN_RULES_EN = (
+    # 检查基础结构
+    _Rule(lambda f: not f['has_overview'],
+          ImprovementType.ADD_SECTION, "Overview",
+          "Add system overview section with design goals and approach",
+          Priority.HIGH, "overview_en"),
+    _Rule(lambda f: not f['has_architecture'],
+          ImprovementType.ADD_SECTION, "Architecture",
+          "Add architecture design section with system architecture diagram",
+          Priority.HIGH, "architecture_en"),
+    _Rule(lambda f: not f['has_components'],
+          ImprovementType.ADD_COMPONENT_DETAIL, "Components",
+          "Add components design section with detailed component descriptions",
+          Priority.HIGH, "components_en"),
+    # 检查需求追溯
+    _Rule(lambda f: f['req_references'] < 3,
+          ImprovementType.ADD_TRACEABILITY, "全文",
+          "Add requirements traceability (current {req_references}, target 5+)",
+          Priority.HIGH, "traceability_en",
+          lambda f: {'current_count': f['req_references'], 'target_count': 5}),
+    _Rule(lambda f: f['bidirectional_refs'] == 0,
+          ImprovementType.ADD_TRACEABILITY, "Components",
+          "Add 'Validates: Requirements X.Y' annotations to design elements",
+          Priority.HIGH, "validates_annotation"),
+    # 检查架构图
+    _Rule(lambda f: f['mermaid_count'] == 0,
+          ImprovementType.ADD_DIAGRAM, "Architecture",
+          "Add Mermaid architecture or design diagrams",
+          Priority.MEDIUM, "mermaid_diagram_en"),
+    # 检查组件详细度
+    _Rule(lambda f: f['component_sections'] < 3,
+          ImprovementType.ADD_COMPONENT_DETAIL, "Components",
+          "Add more component descriptions (current {component_sections}, suggest 3+)",
+          Priority.MEDIUM, None,
+          lambda f: {'current_count': f['component_sections']}),
+    # 检查接口定义
+    _Rule(lambda f: f['interface_count'] < 2,
+          ImprovementType.ADD_COMPONENT_DETAIL, "Components",
+          "Add interface definitions and method signatures to components",
+          Priority.MEDIUM, "interface_definition"),
+    # 检查技术选型
+    _Rule(lambda f: not f['has_tech'],
+          ImprovementType.ADD_RATIONALE, "Technology Stack",
+          "Add technology stack explanation and rationale",
+          Priority.MEDIUM, "technology_stack_en"),
+    # 检查错误处理策略
+    _Rule(lambda f: not f['has_error_handling'],
+          ImprovementType.ADD_SECTION, "Error Handling",
+          "Add error handling strategy section",
+          Priority.MEDIUM, "error_handling_design_en"),
+    # 检查非功能需求设计
+    _Rule(lambda f: len(f['missing_nfr']) >= 2,
+          ImprovementType.ADD_COMPONENT_DETAIL, "Non-functional Design",
+          "Add non-functional design: {missing_nfr_text}",
+          Priority.MEDIUM, "nfr_design_en",
+          lambda f: {'missing_nfr': f['missing_nfr']}),
+    # 检查正确性属性
+    _Rule(lambda f: not f['has_properties'],
+          ImprovementType.ADD_PROPERTIES, "Correctness Properties",
+          "Add correctness properties section for property-based testing",
+          Priority.LOW, "correctness_properties_en"),
+)
 
 
 class ImprovementIdentifier:
     """
     改进识别器 - 识别文档改进点
     
-    支持中英文文档
+    支持中英文文档。识别分两步：先一次性计算文档事实（计数、章节是否存在），
+    再按语言对应的规则表逐条判定
     """
-    
+
+    # 设计决策：不要添加 `@numba.njit`。
+    # 本类的负载全部是字符串/正则处理，没有数值数组：nopython 模式不支持 `re`
+    # （见 numba#7300），字符串支持也很有限，且 numba 导入本身就有数百毫秒开销。
+    # 需要加速时，走已由 C 实现的标准库路径（预编译 `re`、`str` 子串查找）。
+    # 关键词计数也一样：每组只有 3~7 个关键词，`kw in content` 已是 C 层的快速查找，
+    # 改写成 njit 多模式匹配内核还要先做 encode + np.frombuffer 拷贝，得不偿失。
+    # 同理，不要为 ASCII 字面量检查先把 content 编码成 bytes：对典型 spec 文档
+    # （数 KB）而言，encode 本身的完整拷贝比宽字符串上的子串查找更慢。
+
     def __init__(self):
         self.language = 'en'
+        # (content, language) -> 改进列表。键直接使用内容字符串而不是 hash(content)：
+        # str 会缓存自身哈希，命中时只做一次比较而不再执行正则扫描，也不会因哈希碰撞误命中
+        self._requirements_cache = OrderedDict()
+        # Design 同理：(design_content, language) -> 改进列表。识别结果只取决于这两者
+        self._design_cache = OrderedDict()
+        # 按语言分派到各自的识别实现，其他语言按英文处理
+        self._req_identifiers = {
+            'zh': self._identify_requirements_zh,
+            'en': self._identify_requirements_en,
+        }
 
     def identify_requirements_improvements(self, content: str, assessment) -> List[Improvement]:
         """识别 Requirements 文档的改进点 - 支持中英文，增强改进识别"""
-        improvements = []
         lang = assessment.language
         self.language = lang
         
-        if lang == 'zh':
-            # 中文改进建议 - 增强版
-            # 检查基础结构
-            if "## 1. 概述" not in content and "## Introduction" not in content and "## 概述" not in content:
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_SECTION,
-                    target_section="概述",
-                    description="添加项目概述章节，包括项目背景和目标",
-                    priority=Priority.HIGH,
-                    template="introduction_zh"
-                ))
-            
-            if "## 2. 用户故事" not in content and "用户故事" not in content:
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_SECTION,
-                    target_section="用户故事",
-                    description="添加用户故事章节，描述用户需求",
-                    priority=Priority.HIGH,
-                    template="user_stories_zh"
-                ))
-            
-            if "## 3. 功能需求" not in content and "功能需求" not in content:
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_SECTION,
-                    target_section="功能需求",
-                    description="添加功能需求章节",
-                    priority=Priority.HIGH,
-                    template="functional_requirements_zh"
-                ))
-            
-            if "## 4. 非功能需求" not in content and "非功能需求" not in content:
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_NFR,
-                    target_section="非功能需求",
-                    description="添加非功能需求章节，包括性能、安全等",
-                    priority=Priority.MEDIUM,
-                    template="nfr_section_zh"
-                ))
-            
-            # 检查 EARS 格式
-            ears_count = len(re.findall(r'(?:WHEN|当|如果).*?(?:THEN|那么|则).*?(?:SHALL|应该|必须)', content, re.IGNORECASE | re.DOTALL))
-            if ears_count < 5:
-                improvements.append(Improvement(
-                    type=ImprovementType.ENHANCE_CRITERIA,
-                    target_section="验收标准",
-                    description=f"增加更多 EARS 格式的验收标准 (当前 {ears_count}，目标 5+)",
-                    priority=Priority.HIGH,
-                    template="ears_criteria_zh",
-                    metadata={'current_count': ears_count, 'target_count': 5}
-                ))
-            
-            # 检查用户故事格式
-            user_story_count = len(re.findall(r'(?:作为|As a).*?(?:我希望|I want).*?(?:以便|So that)', content, re.IGNORECASE | re.DOTALL))
-            if user_story_count < 3:
-                improvements.append(Improvement(
-                    type=ImprovementType.ENHANCE_CRITERIA,
-                    target_section="用户故事",
-                    description=f"完善用户故事格式 (当前 {user_story_count}，目标 3+)",
-                    priority=Priority.HIGH,
-                    template="user_story_format_zh",
-                    metadata={'current_count': user_story_count, 'target_count': 3}
-                ))
-            
-            # 检查验收标准完整性
-            acceptance_criteria = len(re.findall(r'(?:\*\*验收标准\*\*:|Acceptance Criteria)', content, re.IGNORECASE))
-            requirements_count = len(re.findall(r'### \d+\.\d+', content))
-            if requirements_count > 0 and acceptance_criteria < requirements_count:
-                improvements.append(Improvement(
-                    type=ImprovementType.ENHANCE_CRITERIA,
-                    target_section="验收标准",
-                    description=f"为所有需求添加验收标准 ({acceptance_criteria}/{requirements_count})",
-                    priority=Priority.HIGH,
-                    metadata={'current': acceptance_criteria, 'total': requirements_count}
-                ))
-            
-            # 检查非功能需求覆盖
-            nfr_keywords = ['性能', '安全', '可用性', '可维护性', '兼容性', '可扩展性']
-            missing_nfr = [kw for kw in nfr_keywords if kw not in content]
-            
-            if missing_nfr and ("## 4. 非功能需求" in content or "非功能需求" in content):
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_NFR,
-                    target_section="非功能需求",
-                    description=f"补充非功能需求: {', '.join(missing_nfr[:3])}",
-                    priority=Priority.MEDIUM,
-                    template="nfr_items_zh",
-                    metadata={'missing_nfr': missing_nfr}
-                ))
-            
-            # 检查错误处理需求
-            if "错误处理" not in content and "异常处理" not in content:
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_ERROR_HANDLING,
-                    target_section="功能需求",
-                    description="添加错误处理和异常情况需求",
-                    priority=Priority.MEDIUM,
-                    template="error_handling_zh"
-                ))
-            
-            # 检查边界条件
-            edge_case_keywords = ['边界', '极限', '最大', '最小', '空值', '异常']
-            edge_case_count = sum(1 for kw in edge_case_keywords if kw in content)
-            if edge_case_count < 2:
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_EDGE_CASES,
-                    target_section="验收标准",
-                    description="添加边界条件和极限情况的验收标准",
-                    priority=Priority.MEDIUM,
-                    template="edge_cases_zh"
-                ))
-            
-            # 检查约束条件
-            if "约束条件" not in content and "限制" not in content:
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_SECTION,
-                    target_section="约束条件",
-                    description="添加约束条件和限制说明",
-                    priority=Priority.LOW,
-                    template="constraints_zh"
-                ))
-        else:
-            # 英文改进建议 - 增强版
-            # 检查基础结构
-            if "## Introduction" not in content and "## Overview" not in content:
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_SECTION,
-                    target_section="Introduction",
-                    description="Add Introduction or Overview section with project background and goals",
-                    priority=Priority.HIGH,
-                    template="introduction_en"
-                ))
-            
-            if "## Glossary" not in content and "## Terminology" not in content:
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_GLOSSARY_TERM,
-                    target_section="Glossary",
-                    description="Add Glossary section to define key terms",
-                    priority=Priority.MEDIUM,
-                    template="glossary_en"
-                ))
-            
-            if "User Story" not in content and "user story" not in content.lower():
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_SECTION,
-                    target_section="User Stories",
-                    description="Add User Stories section",
-                    priority=Priority.HIGH,
-                    template="user_stories_en"
-                ))
-            
-            if "## Requirements" not in content and "## Functional Requirements" not in content:
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_SECTION,
-                    target_section="Requirements",
-                    description="Add Requirements or Functional Requirements section",
-                    priority=Priority.HIGH,
-                    template="functional_requirements_en"
-                ))
-            
-            # 检查 EARS 格式
-            ears_count = len(re.findall(r'(?:WHEN|IF|WHILE|WHERE).*?(?:THEN|THE\s+system\s+SHALL)', content, re.IGNORECASE | re.DOTALL))
-            if ears_count < 5:
-                improvements.append(Improvement(
-                    type=ImprovementType.ENHANCE_CRITERIA,
-                    target_section="Acceptance Criteria",
-                    description=f"Add more EARS-format acceptance criteria (currently {ears_count}, target 5+)",
-                    priority=Priority.HIGH,
-                    template="ears_criteria_en",
-                    metadata={'current_count': ears_count, 'target_count': 5}
-                ))
-            
-            # 检查用户故事格式
-            user_story_count = len(re.findall(r'(?:As a|As an).*?I want.*?(?:So that|so that)', content, re.IGNORECASE | re.DOTALL))
-            if user_story_count < 3:
-                improvements.append(Improvement(
-                    type=ImprovementType.ENHANCE_CRITERIA,
-                    target_section="User Stories",
-                    description=f"Add more user stories in 'As a...I want...So that' format (currently {user_story_count}, target 3+)",
-                    priority=Priority.HIGH,
-                    template="user_story_format_en",
-                    metadata={'current_count': user_story_count, 'target_count': 3}
-                ))
-            
-            # 检查验收标准完整性
-            acceptance_criteria = len(re.findall(r'(?:Acceptance Criteria|#### Acceptance Criteria)', content, re.IGNORECASE))
-            requirements_count = len(re.findall(r'### Requirement \d+', content, re.IGNORECASE))
-            if requirements_count > 0 and acceptance_criteria < requirements_count:
-                improvements.append(Improvement(
-                    type=ImprovementType.ENHANCE_CRITERIA,
-                    target_section="Acceptance Criteria",
-                    description=f"Add acceptance criteria for all requirements ({acceptance_criteria}/{requirements_count})",
-                    priority=Priority.HIGH,
-                    metadata={'current': acceptance_criteria, 'total': requirements_count}
-                ))
-            
-            # 检查非功能需求
-            nfr_keywords = ['performance', 'security', 'usability', 'maintainability', 'scalability', 'reliability']
-            missing_nfr = [kw for kw in nfr_keywords if kw.lower() not in content.lower()]
-            
-            if len(missing_nfr) > 2:
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_NFR,
-                    target_section="Non-functional Requirements",
-                    description=f"Add non-functional requirements: {', '.join(missing_nfr[:3])}",
-                    priority=Priority.MEDIUM,
-                    template="nfr_section_en",
-                    metadata={'missing_nfr': missing_nfr[:3]}
-                ))
-            
-            # 检查错误处理需求
-            if "error handling" not in content.lower() and "exception" not in content.lower():
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_ERROR_HANDLING,
-                    target_section="Requirements",
-                    description="Add error handling and exception requirements",
-                    priority=Priority.MEDIUM,
-                    template="error_handling_en"
-                ))
-            
-            # 检查边界条件
-            edge_case_keywords = ['boundary', 'edge case', 'limit', 'maximum', 'minimum', 'empty', 'null']
-            edge_case_count = sum(1 for kw in edge_case_keywords if kw.lower() in content.lower())
-            if edge_case_count < 2:
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_EDGE_CASES,
-                    target_section="Acceptance Criteria",
-                    description="Add boundary conditions and edge cases to acceptance criteria",
-                    priority=Priority.MEDIUM,
-                    template="edge_cases_en"
-                ))
-            
-            # 检查约束条件
-            if "constraint" not in content.lower() and "limitation" not in content.lower():
-                improvements.append(Improvement(
-                    type=ImprovementType.ADD_SECTION,
-                    target_section="Constraints",
-                    description="Add constraints and limitations section",
-                    priority=Priority.LOW,
-                    template="constraints_en"
-                ))
+        cache_key = (content, lang)
+        cached = self._requirements_cache.get(cache_key)
+        if cached is not None:
+            self._requirements_cache.move_to_end(cache_key)
+            return list(cached)
+        
+        identify = self._req_identifiers.get(lang, self._identify_requirements_en)
+        improvements = identify(content)
         
-        return improvements
+        self._requirements_cache[cache_key] = improvements
+        if len(self._requirements_cache) > _IDENTIFY_CACHE_SIZE:
+            self._requirements_cache.popitem(last=False)
+        
+        return list(improvements)
+    
+    def _identify_requirements_zh(self, content: str) -> List[Improvement]:
+        """识别中文 Requirements 文档的改进点"""
+        # 带编号的标题（如 "## 2. 用户故事"）已被对应关键词的子串检查覆盖，无需单独扫描
+        missing_nfr = [kw for kw in _NFR_KEYWORDS_ZH if kw not in content]
+        blocks = _BLOCK_SPLIT_RE.split(content)
+        facts = {
+            'has_intro': "## 1. 概述" in content or "## Introduction" in content or "## 概述" in content,
+            'has_user_stories': "用户故事" in content,
+            'has_functional': "功能需求" in content,
+            'has_nfr_section': "非功能需求" in content,
+            'ears_count': _count_per_block(_EARS_ZH_RE, blocks),
+            'user_story_count': _count_per_block(_USER_STORY_ZH_RE, blocks),
+            'acceptance_criteria': len(_ACCEPTANCE_ZH_RE.findall(content)),
+            'requirements_count': len(_NUMBERED_SECTION_RE.findall(content)) if '### ' in content else 0,
+            'missing_nfr': missing_nfr,
+            'missing_nfr_text': ', '.join(missing_nfr[:3]),
+            'has_error_handling': "错误处理" in content or "异常处理" in content,
+            'edge_case_count': sum(1 for kw in _EDGE_CASE_KEYWORDS_ZH if kw in content),
+            'has_constraints': "约束条件" in content or "限制" in content,
+        }
+        return [rule.build(facts) for rule in _REQ_RULES_ZH if rule.check(facts)]
+    
+    def _identify_requirements_en(self, content: str) -> List[Improvement]:
+        """识别英文 Requirements 文档的改进点"""
+        # 大小写不敏感的检查共用一份小写副本
+        content_lower = content.lower()
+        
+        # 只用到前 3 个缺失项，凑满即停止扫描
+        missing_nfr = []
+        for kw in _NFR_KEYWORDS_EN:
+            if kw not in content_lower:
+                missing_nfr.append(kw)
+                if len(missing_nfr) == 3:
+                    break
+        
+        blocks = _BLOCK_SPLIT_RE.split(content)
+        facts = {
+            'has_intro': "## Introduction" in content or "## Overview" in content,
+            'has_glossary': "## Glossary" in content or "## Terminology" in content,
+            'has_user_stories': "user story" in content_lower,
+            'has_functional': "## Requirements" in content or "## Functional Requirements" in content,
+            'ears_count': _count_per_block(_EARS_EN_RE, blocks),
+            'user_story_count': _count_per_block(_USER_STORY_EN_RE, blocks),
+            'acceptance_criteria': len(_ACCEPTANCE_EN_RE.findall(content)),
+            'requirements_count': len(_REQUIREMENT_HEADER_EN_RE.findall(content)) if '### ' in content else 0,
+            'missing_nfr': missing_nfr,
+            'missing_nfr_text': ', '.join(missing_nfr),
+            'has_error_handling': "error handling" in content_lower or "exception" in content_lower,
+            'edge_case_count': sum(1 for kw in _EDGE_CASE_KEYWORDS_EN if kw in content_lower),
+            'has_constraints': "constraint" in content_lower or "limitation" in content_lower,
+        }
+        return [rule.build(facts) for rule in _REQ_RULES_EN if rule.check(facts)]
     
     def identify_design_improvements(self, design_content: str, requirements_content: str, assessment) -> List[Improvement]:
         """识别 Design 文档的改进点 - 增强版"""
-        improvements = []
         lang = assessment.language
         self.language = lang
         
-        # 检查基础结构
-        if "## 1. 系统概述" not in design_content and "## 1. 概述" not in design_content and "## Overview" not in design_content:
-            improvements.append(Improvement(
-                type=ImprovementType.ADD_SECTION,
-                target_section="系统概述" if lang == 'zh' else "Overview",
-                description="添加系统概述章节，包括设计目标和方法" if lang == 'zh' else "Add system overview section with design goals and approach",
-                priority=Priority.HIGH,
-                template="overview_zh" if lang == 'zh' else "overview_en"
-            ))
-        
-        if "## 2. 架构设计" not in design_content and "## Architecture" not in design_content:
-            improvements.append(Improvement(
-                type=ImprovementType.ADD_SECTION,
-                target_section="架构设计" if lang == 'zh' else "Architecture",
-                description="添加架构设计章节，包括系统架构图" if lang == 'zh' else "Add architecture design section with system architecture diagram",
-                priority=Priority.HIGH,
-                template="architecture_zh" if lang == 'zh' else "architecture_en"
-            ))
-        
-        if "## 3. 组件设计" not in design_content and "## Components" not in design_content:
-            improvements.append(Improvement(
-                type=ImprovementType.ADD_COMPONENT_DETAIL,
-                target_section="组件设计" if lang == 'zh' else "Components",
-                description="添加组件设计章节，详细描述各组件" if lang == 'zh' else "Add components design section with detailed component descriptions",
-                priority=Priority.HIGH,
-                template="components_zh" if lang == 'zh' else "components_en"
-            ))
-        
-        # 检查需求追溯
-        req_references = len(re.findall(r'(?:需求|Requirements?|Validates:)\s*\d+\.\d+', design_content, re.IGNORECASE))
-        bidirectional_refs = len(re.findall(r'Validates:\s*Requirements?\s+\d+\.\d+', design_content, re.IGNORECASE))
-        
-        if req_references < 3:
-            improvements.append(Improvement(
-                type=ImprovementType.ADD_TRACEABILITY,
-                target_section="全文" if lang == 'zh' else "全文",
-                description=f"增加需求到设计的双向追溯 (当前 {req_references}，目标 5+)" if lang == 'zh' else f"Add requirements traceability (current {req_references}, target 5+)",
-                priority=Priority.HIGH,
-                template="traceability_zh" if lang == 'zh' else "traceability_en",
-                metadata={'current_count': req_references, 'target_count': 5}
-            ))
-        
-        if bidirectional_refs == 0:
-            improvements.append(Improvement(
-                type=ImprovementType.ADD_TRACEABILITY,
-                target_section="组件设计" if lang == 'zh' else "Components",
-                description="为设计元素添加 'Validates: Requirements X.Y' 注释" if lang == 'zh' else "Add 'Validates: Requirements X.Y' annotations to design elements",
-                priority=Priority.HIGH,
-                template="validates_annotation"
-            ))
-        
-        # 检查架构图
-        mermaid_count = len(re.findall(r'```mermaid', design_content))
-        if mermaid_count == 0:
-            improvements.append(Improvement(
-                type=ImprovementType.ADD_DIAGRAM,
-                target_section="架构设计" if lang == 'zh' else "Architecture",
-                description="添加 Mermaid 架构图或设计图" if lang == 'zh' else "Add Mermaid architecture or design diagrams",
-                priority=Priority.MEDIUM,
-                template="mermaid_diagram_zh" if lang == 'zh' else "mermaid_diagram_en"
-            ))
-        
-        # 检查组件详细度
-        component_sections = len(re.findall(r'### \d+\.\d+', design_content))
-        if component_sections < 3:
-            improvements.append(Improvement(
-                type=ImprovementType.ADD_COMPONENT_DETAIL,
-                target_section="组件设计" if lang == 'zh' else "Components",
-                description=f"增加更多组件描述 (当前 {component_sections}，建议 3+)" if lang == 'zh' else f"Add more component descriptions (current {component_sections}, suggest 3+)",
-                priority=Priority.MEDIUM,
-                metadata={'current_count': component_sections}
-            ))
+        cache_key = (design_content, lang)
+        cached = self._design_cache.get(cache_key)
+        if cached is not None:
+            self._design_cache.move_to_end(cache_key)
+            return list(cached)
         
-        # 检查接口定义
-        interface_count = len(re.findall(r'(?:接口定义|Interface|API)', design_content, re.IGNORECASE))
-        if interface_count < 2:
-            improvements.append(Improvement(
-                type=ImprovementType.ADD_COMPONENT_DETAIL,
-                target_section="组件设计" if lang == 'zh' else "Components",
-                description="为组件添加接口定义和方法签名" if lang == 'zh' else "Add interface definitions and method signatures to components",
-                priority=Priority.MEDIUM,
-                template="interface_definition"
-            ))
+        improvements = self._identify_design(design_content, lang)
         
-        # 检查技术选型
-        tech_keywords = ['技术选型', '技术栈', '框架选择'] if lang == 'zh' else ['technology', 'framework', 'stack']
-        if not any(keyword.lower() in design_content.lower() for keyword in tech_keywords):
-            improvements.append(Improvement(
-                type=ImprovementType.ADD_RATIONALE,
-                target_section="技术选型" if lang == 'zh' else "Technology Stack",
-                description="补充技术选型说明和选型理由" if lang == 'zh' else "Add technology stack explanation and rationale",
-                priority=Priority.MEDIUM,
-                template="technology_stack_zh" if lang == 'zh' else "technology_stack_en"
-            ))
+        self._design_cache[cache_key] = improvements
+        if len(self._design_cache) > _IDENTIFY_CACHE_SIZE:
+            self._design_cache.popitem(last=False)
         
-        # 检查错误处理策略
-        if "错误处理" not in design_content and "Error Handling" not in design_content:
-            improvements.append(Improvement(
-                type=ImprovementType.ADD_SECTION,
-                target_section="错误处理" if lang == 'zh' else "Error Handling",
-                description="添加错误处理策略章节" if lang == 'zh' else "Add error handling strategy section",
-                priority=Priority.MEDIUM,
-                template="error_handling_design_zh" if lang == 'zh' else "error_handling_design_en"
-            ))
-        
-        # 检查非功能需求设计
-        nfr_design = ['性能设计', '安全设计', '可扩展性'] if lang == 'zh' else ['performance', 'security', 'scalability']
-        missing_nfr = [nfr for nfr in nfr_design if nfr.lower() not in design_content.lower()]
-        if len(missing_nfr) >= 2:
-            improvements.append(Improvement(
-                type=ImprovementType.ADD_COMPONENT_DETAIL,
-                target_section="非功能需求设计" if lang == 'zh' else "Non-functional Design",
-                description=f"补充非功能需求设计: {', '.join(missing_nfr)}" if lang == 'zh' else f"Add non-functional design: {', '.join(missing_nfr)}",
-                priority=Priority.MEDIUM,
-                template="nfr_design_zh" if lang == 'zh' else "nfr_design_en",
-                metadata={'missing_nfr': missing_nfr}
-            ))
+        return list(improvements)
+    
+    @staticmethod
+    def _identify_design(design_content: str, lang: str) -> List[Improvement]:
+        """识别 Design 文档的改进点（不经缓存）"""
+        design_lower = design_content.lower()
+        if lang == 'zh':
+            tech_keywords = _TECH_KEYWORDS_ZH
+            nfr_design = _NFR_DESIGN_KEYWORDS_ZH
+            rules = _DESIGN_RULES_ZH
+        else:
+            tech_keywords = _TECH_KEYWORDS_EN
+            nfr_design = _NFR_DESIGN_KEYWORDS_EN
+            rules = _DESIGN_RULES_EN
         
-        # 检查正确性属性
-        if "Correctness Properties" not in design_content and "正确性属性" not in design_content:
-            improvements.append(Improvement(
-                type=ImprovementType.ADD_PROPERTIES,
-                target_section="正确性属性" if lang == 'zh' else "Correctness Properties",
-                description="添加正确性属性章节，用于属性测试" if lang == 'zh' else "Add correctness properties section for property-based testing",
-                priority=Priority.LOW,
-                template="correctness_properties_zh" if lang == 'zh' else "correctness_properties_en"
-            ))
+        missing_nfr = [nfr for nfr in nfr_design if nfr not in design_lower]
+        facts = {
+            'has_overview': "## 1. 系统概述" in design_content or "## 1. 概述" in design_content or "## Overview" in design_content,
+            'has_architecture': "## 2. 架构设计" in design_content or "## Architecture" in design_content,
+            'has_components': "## 3. 组件设计" in design_content or "## Components" in design_content,
+            'req_references': len(_REQ_REF_RE.findall(design_content)),
+            'bidirectional_refs': len(_BIDIR_REF_RE.findall(design_content)),
+            'mermaid_count': len(_MERMAID_RE.findall(design_content)),
+            # 规则只关心是否达到 3 个（不足时才展示具体数目），数到 3 即停止扫描
+            'component_sections': sum(1 for _ in islice(_NUMBERED_SECTION_RE.finditer(design_content), 3)),
+            'interface_count': len(_INTERFACE_RE.findall(design_content)),
+            'has_tech': any(keyword in design_lower for keyword in tech_keywords),
+            'has_error_handling': "错误处理" in design_content or "Error Handling" in design_content,
+            'missing_nfr': missing_nfr,
+            'missing_nfr_text': ', '.join(missing_nfr),
+            'has_properties': "Correctness Properties" in design_content or "正确性属性" in design_content,
+        }
         
-        return improvements
+        return [rule.build(facts) for rule in rules if rule.check(facts)]
+
+
+# ==================== 批量识别 ====================
+
+# 每个工作进程各自持有一个识别器，进程内的识别缓存可被后续文档复用
+_worker_identifier = None
+
+
+def _identify_requirements_worker(item: Tuple[str, str]) -> List[Improvement]:
+    """进程池工作函数：只接收 (content, language)，避免 pickle 整个评估对象"""
+    global _worker_identifier
+    if _worker_identifier is None:
+        _worker_identifier = ImprovementIdentifier()
+    content, language = item
+    return _worker_identifier.identify_requirements_improvements(content, SimpleNamespace(language=language))
+
+
+def identify_requirements_batch(documents: Sequence[Tuple[str, object]],
+                                max_workers: Optional[int] = None) -> List[List[Improvement]]:
+    """
+    批量识别多份 Requirements 文档的改进点
+    
+    documents 为 (content, assessment) 序列，结果按输入顺序返回。
+    正则扫描全程持有 GIL，线程池无法并行，因此使用进程池；
+    文档少于 2 份或 max_workers == 1 时直接在当前进程内顺序识别，省去进程启动开销
+    """
+    items = [(content, assessment.language) for content, assessment in documents]
+    if len(items) < 2 or max_workers == 1:
+        return [_identify_requirements_worker(item) for item in items]
+    
+    # 进程池模块导入较重（multiprocessing），只在真正并行时才加载
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_identify_requirements_worker, items))
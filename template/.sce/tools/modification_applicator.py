@@ -6,148 +6,413 @@ Modification Applicator - 修改应用组件
 """
 
 import re
+import sys
+from functools import partial
 from typing import List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from improvement_identifier import ImprovementType, Priority
 
-@dataclass
+
+# slots=True 需要 Python 3.10+，旧版本退化为普通 dataclass
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# 改进排序用的优先级序号（高优先级先应用），未知优先级排在最后。
+# sorted(key=...) 本身就对每个元素只计算一次 key（内部即装饰-排序-去装饰），无需手工改写
+_PRIORITY_RANK = {Priority.HIGH: 0, Priority.MEDIUM: 1, Priority.LOW: 2}
+
+
+def _priority_rank(improvement) -> int:
+    return _PRIORITY_RANK.get(improvement.priority, 2)
+
+
+# ==================== 定位模式 ====================
+# 插入位置的定位模式在模块加载时编译一次，各修改方法直接调用，不再经过 re 的模式缓存。
+# 章节只用正则定位标题，章节结尾（下一个标题）用 str.find 查找，
+# 代替 DOTALL 下逐字符尝试的 `.*?(\n## |\Z)` 惰性匹配
+
+_H1_LINE_RE = re.compile(r'^# [^\n]*', re.MULTILINE)
+_NFR_HEADING_RE = re.compile(r'## (?:4\. )?非功能需求|## Non-functional Requirements', re.IGNORECASE)
+_REQ_SECTION_RE = re.compile(r'(### (?:Requirement )?\d+\.\d+[^\n]*\n)')
+_FUNC_REQ_ZH_RE = re.compile(r'## 3\. 功能需求')
+_FUNC_REQ_EN_RE = re.compile(r'## (?:Functional )?Requirements')
+_ACCEPTANCE_ZH_RE = re.compile(r'\*\*验收标准\*\*:')
+_ACCEPTANCE_EN_RE = re.compile(r'#### Acceptance Criteria')
+_INTRO_ZH_RE = re.compile(r'## (?:1\. )?概述', re.IGNORECASE)
+_INTRO_EN_RE = re.compile(r'## (?:Introduction|Overview)', re.IGNORECASE)
+_ARCHITECTURE_ZH_RE = re.compile(r'## (?:2\. )?架构设计', re.IGNORECASE)
+_ARCHITECTURE_EN_RE = re.compile(r'## (?:System )?Architecture', re.IGNORECASE)
+_COMPONENTS_ZH_RE = re.compile(r'## (?:3\. )?组件设计', re.IGNORECASE)
+_COMPONENTS_EN_RE = re.compile(r'## Components', re.IGNORECASE)
+_COMPONENT_HEADING_RE = re.compile(r'(### \d+\.\d+ [^\n]+\n)')
+
+# 章节结束边界：下一个二级标题，或下一个二级/三级标题
+_H2_BOUNDARY = ('\n## ',)
+_H2_H3_BOUNDARY = ('\n### ', '\n## ')
+
+
+def _append_section(content: str, template: str) -> str:
+    """把模板作为新章节追加到文档末尾（去掉末尾空白后空一行）"""
+    # 先拼接短的分隔符和模板，整篇文档只在 rstrip 和最终拼接时各复制一次
+    return content.rstrip() + ('\n\n' + template)
+
+
+def _section_end(content: str, start: int, boundaries: Tuple[str, ...]) -> int:
+    """返回 start 之后最近的章节边界位置，没有边界时返回文档末尾"""
+    end = len(content)
+    for boundary in boundaries:
+        # 只需在已知最近边界之前查找
+        idx = content.find(boundary, start, end)
+        if idx >= 0:
+            end = idx
+    return end
+
+
+# ==================== 模板常量 ====================
+# 按语言区分的固定模板，模块加载时创建一次，由 _get_*_template 直接返回
+
+_NFR_TEMPLATE_ZH = """## 4. 非功能需求
+
+### 4.1 性能需求
+- 系统响应时间应小于 2 秒
+- 支持并发用户数不少于 100
+
+### 4.2 安全需求
+- 用户数据必须加密存储
+- 实施访问控制和身份验证
+
+### 4.3 可用性需求
+- 系统可用性应达到 99.9%
+- 提供友好的用户界面
+
+### 4.4 可维护性需求
+- 代码应遵循编码规范
+- 提供完整的技术文档
+"""
+
+_NFR_TEMPLATE_EN = """## Non-functional Requirements
+
+### Performance Requirements
+- System response time should be less than 2 seconds
+- Support at least 100 concurrent users
+
+### Security Requirements
+- User data must be encrypted at rest
+- Implement access control and authentication
+
+### Usability Requirements
+- System availability should reach 99.9%
+- Provide user-friendly interface
+
+### Maintainability Requirements
+- Code should follow coding standards
+- Provide complete technical documentation
+"""
+
+_ERROR_HANDLING_TEMPLATE_ZH = """### 错误处理需求
+
+**用户故事**: 作为用户，我希望系统能够优雅地处理错误，以便我了解问题并采取相应措施。
+
+**验收标准**:
+1. WHEN 系统遇到错误 THEN 系统应该显示清晰的错误消息
+2. WHEN 发生异常 THEN 系统应该记录错误日志
+3. WHEN 出现致命错误 THEN 系统应该安全关闭并保存数据
+"""
+
+_ERROR_HANDLING_TEMPLATE_EN = """### Error Handling Requirements
+
+**User Story**: As a user, I want the system to handle errors gracefully, so that I understand the issue and can take appropriate action.
+
+**Acceptance Criteria**:
+1. WHEN the system encounters an error THEN THE system SHALL display a clear error message
+2. WHEN an exception occurs THEN THE system SHALL log the error
+3. WHEN a fatal error occurs THEN THE system SHALL shut down safely and save data
+"""
+
+_GLOSSARY_TEMPLATE_ZH = """## 术语表
+
+- **系统**: 指本文档描述的软件系统
+- **用户**: 使用系统的最终用户
+- **管理员**: 具有系统管理权限的用户
+"""
+
+_GLOSSARY_TEMPLATE_EN = """## Glossary
+
+- **System**: The software system described in this document
+- **User**: End user who uses the system
+- **Administrator**: User with system administration privileges
+"""
+
+_ARCHITECTURE_DIAGRAM_TEMPLATE_ZH = """### 系统架构图
+
+```mermaid
+graph TB
+    A[用户界面] --> B[业务逻辑层]
+    B --> C[数据访问层]
+    C --> D[数据存储]
+```
+"""
+
+_ARCHITECTURE_DIAGRAM_TEMPLATE_EN = """### System Architecture Diagram
+
+```mermaid
+graph TB
+    A[User Interface] --> B[Business Logic Layer]
+    B --> C[Data Access Layer]
+    C --> D[Data Storage]
+```
+"""
+
+_TECHNOLOGY_STACK_TEMPLATE_ZH = """## 技术选型
+
+### 核心技术栈
+- **前端**: React/Vue.js
+- **后端**: Node.js/Python
+- **数据库**: PostgreSQL/MongoDB
+- **缓存**: Redis
+
+### 选型理由
+- 考虑团队技术栈熟悉度
+- 满足性能和扩展性要求
+- 社区支持和生态完善
+"""
+
+_TECHNOLOGY_STACK_TEMPLATE_EN = """## Technology Stack
+
+### Core Technologies
+- **Frontend**: React/Vue.js
+- **Backend**: Node.js/Python
+- **Database**: PostgreSQL/MongoDB
+- **Cache**: Redis
+
+### Selection Rationale
+- Team familiarity with technology stack
+- Meets performance and scalability requirements
+- Strong community support and ecosystem
+"""
+
+_CORRECTNESS_PROPERTIES_TEMPLATE_ZH = """## 正确性属性
+
+### 属性 1: 数据一致性
+*对于任何*数据操作，操作完成后数据应保持一致状态。
+
+**验证**: Requirements 1.1, 1.2
+
+### 属性 2: 操作幂等性
+*对于任何*幂等操作，多次执行应产生相同结果。
+
+**验证**: Requirements 2.1
+"""
+
+_CORRECTNESS_PROPERTIES_TEMPLATE_EN = """## Correctness Properties
+
+### Property 1: Data Consistency
+*For any* data operation, data should remain in a consistent state after the operation completes.
+
+**Validates**: Requirements 1.1, 1.2
+
+### Property 2: Operation Idempotency
+*For any* idempotent operation, multiple executions should produce the same result.
+
+**Validates**: Requirements 2.1
+"""
+
+
+# 按模板名查找的章节模板（improvement.template 或目标章节名）
+_SECTION_TEMPLATES = {
+    'introduction_zh': """## 1. 概述
+
+本文档描述了系统的需求规格说明。
+
+### 1.1 项目背景
+[待补充项目背景信息]
+
+### 1.2 项目目标
+[待补充项目目标]
+""",
+    'introduction_en': """## Introduction
+
+This document describes the system requirements specification.
+
+### Project Background
+[To be filled with project background information]
+
+### Project Goals
+[To be filled with project goals]
+""",
+    'overview_zh': """## 1. 系统概述
+
+本设计文档描述了系统的架构和组件设计。
+
+### 1.1 设计目标
+- 模块化设计，易于维护和扩展
+- 高性能，满足业务需求
+- 安全可靠，保障数据安全
+
+### 1.2 设计方法
+采用分层架构，将系统划分为表示层、业务逻辑层和数据访问层。
+""",
+    'overview_en': """## Overview
+
+This design document describes the system architecture and component design.
+
+### Design Goals
+- Modular design for easy maintenance and extension
+- High performance to meet business requirements
+- Secure and reliable to ensure data safety
+
+### Design Approach
+Adopts layered architecture, dividing the system into presentation layer, business logic layer, and data access layer.
+""",
+    'architecture_zh': """## 2. 架构设计
+
+### 2.1 系统架构
+
+系统采用三层架构设计：
+
+```mermaid
+graph TB
+    A[表示层] --> B[业务逻辑层]
+    B --> C[数据访问层]
+    C --> D[数据存储]
+```
+
+### 2.2 架构说明
+- **表示层**: 负责用户界面和交互
+- **业务逻辑层**: 处理核心业务逻辑
+- **数据访问层**: 封装数据库操作
+""",
+    'architecture_en': """## Architecture
+
+### System Architecture
+
+The system adopts a three-tier architecture:
+
+```mermaid
+graph TB
+    A[Presentation Layer] --> B[Business Logic Layer]
+    B --> C[Data Access Layer]
+    C --> D[Data Storage]
+```
+
+### Architecture Description
+- **Presentation Layer**: Handles user interface and interaction
+- **Business Logic Layer**: Processes core business logic
+- **Data Access Layer**: Encapsulates database operations
+""",
+    'components_zh': """## 3. 组件设计
+
+### 3.1 组件概述
+系统包含以下核心组件：
+- 用户管理组件
+- 数据处理组件
+- 接口服务组件
+""",
+    'components_en': """## Components
+
+### Component Overview
+The system includes the following core components:
+- User Management Component
+- Data Processing Component
+- Interface Service Component
+"""
+}
+
+
+# 修改报告的固定文案（中英文报告结构相同，只有文案不同）
+_REPORT_LABELS_ZH = {
+    'title': "### 修改报告\n\n",
+    'applied_count': "- 成功应用: {} 项改进\n",
+    'failed_count': "- 失败: {} 项改进\n\n",
+    'applied_header': "#### 已应用的改进:\n",
+    'failed_header': "\n#### 失败的改进:\n",
+}
+
+_REPORT_LABELS_EN = {
+    'title': "### Modification Report\n\n",
+    'applied_count': "- Successfully applied: {} improvements\n",
+    'failed_count': "- Failed: {} improvements\n\n",
+    'applied_header': "#### Applied Improvements:\n",
+    'failed_header': "\n#### Failed Improvements:\n",
+}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ModificationResult:
     """修改结果"""
     modified_content: str
-    applied_improvements: List = None
-    failed_improvements: List[Tuple] = None
+    applied_improvements: List = field(default_factory=list)
+    failed_improvements: List[Tuple] = field(default_factory=list)
     modification_report: str = ""
-    
-    def __post_init__(self):
-        if self.applied_improvements is None:
-            self.applied_improvements = []
-        if self.failed_improvements is None:
-            self.failed_improvements = []
 
 
 class ModificationApplicator:
     """
     修改应用器 - 应用文档改进
     
-    保持内容完整性和格式一致性
+    保持内容完整性和格式一致性。应用器不保存按调用变化的状态（语言由参数传入），
+    同一实例可在多个线程间复用
     """
     
     def __init__(self):
-        self.language = 'en'
+        # 改进类型 -> 修改方法（按枚举成员分派，不再逐个比较 .value 字符串）
+        self._requirements_appliers = {
+            ImprovementType.ADD_SECTION: self._add_section_to_requirements,
+            ImprovementType.ADD_NFR: self._add_nfr_section,
+            ImprovementType.ENHANCE_CRITERIA: self._enhance_acceptance_criteria,
+            ImprovementType.ADD_ERROR_HANDLING: self._add_error_handling_requirements,
+            ImprovementType.ADD_EDGE_CASES: self._add_edge_case_criteria,
+            ImprovementType.ADD_GLOSSARY_TERM: self._add_glossary_section,
+        }
+        self._design_appliers = {
+            ImprovementType.ADD_SECTION: self._add_section_to_design,
+            ImprovementType.ADD_DIAGRAM: self._add_architecture_diagram,
+            ImprovementType.ADD_RATIONALE: self._add_technology_stack,
+            ImprovementType.ADD_COMPONENT_DETAIL: self._add_component_details,
+            ImprovementType.ADD_PROPERTIES: self._add_correctness_properties,
+        }
 
-    def apply_requirements_improvements(self, content: str, improvements: List, language: str = 'en') -> ModificationResult:
-        """应用 Requirements 改进 - 增强版，真正修改文档"""
-        self.language = language
-        modified_content = content
-        applied = []
-        failed = []
-        
-        # 按优先级排序改进
-        improvements_sorted = sorted(improvements, key=lambda x: (
-            0 if x.priority.value == 'high' else 1 if x.priority.value == 'medium' else 2
-        ))
-        
-        for improvement in improvements_sorted:
-            try:
-                # 根据改进类型应用不同的修改策略
-                if improvement.type.value == "add_section":
-                    result = self._add_section_to_requirements(modified_content, improvement, language)
-                    if result != modified_content:
-                        modified_content = result
-                        applied.append(improvement)
-                
-                elif improvement.type.value == "add_nfr":
-                    result = self._add_nfr_section(modified_content, improvement, language)
-                    if result != modified_content:
-                        modified_content = result
-                        applied.append(improvement)
-                
-                elif improvement.type.value == "enhance_criteria":
-                    result = self._enhance_acceptance_criteria(modified_content, improvement, language)
-                    if result != modified_content:
-                        modified_content = result
-                        applied.append(improvement)
-                
-                elif improvement.type.value == "add_error_handling":
-                    result = self._add_error_handling_requirements(modified_content, improvement, language)
-                    if result != modified_content:
-                        modified_content = result
-                        applied.append(improvement)
-                
-                elif improvement.type.value == "add_edge_cases":
-                    result = self._add_edge_case_criteria(modified_content, improvement, language)
-                    if result != modified_content:
-                        modified_content = result
-                        applied.append(improvement)
-                
-                elif improvement.type.value == "add_glossary_term":
-                    result = self._add_glossary_section(modified_content, improvement, language)
-                    if result != modified_content:
-                        modified_content = result
-                        applied.append(improvement)
-                
-            except Exception as e:
-                failed.append((improvement, e))
-        
-        report = self._generate_modification_report(applied, failed, language)
-        
-        return ModificationResult(
-            modified_content=modified_content,
-            applied_improvements=applied,
-            failed_improvements=failed,
-            modification_report=report
-        )
+    def apply_requirements_improvements(self, content: str, improvements: List, language: str = 'en') -> ModificationResult:
+        """应用 Requirements 改进 - 增强版，真正修改文档"""
+        return self._apply_improvements(content, improvements, self._requirements_appliers, language)
     
     def apply_design_improvements(self, content: str, improvements: List, requirements_content: str, language: str = 'en') -> ModificationResult:
         """应用 Design 改进 - 增强版，真正修改文档"""
-        self.language = language
+        # 需求追溯需要额外的 requirements_content，按调用绑定
+        appliers = dict(self._design_appliers)
+        appliers[ImprovementType.ADD_TRACEABILITY] = partial(
+            self._add_requirements_traceability,
+            requirements_content=requirements_content
+        )
+        
+        return self._apply_improvements(content, improvements, appliers, language)
+    
+    def _apply_improvements(self, content: str, improvements: List, appliers: dict, language: str) -> ModificationResult:
+        """按优先级依次应用改进，没有对应修改方法的改进类型直接跳过"""
         modified_content = content
         applied = []
         failed = []
         
         # 按优先级排序改进
-        improvements_sorted = sorted(improvements, key=lambda x: (
-            0 if x.priority.value == 'high' else 1 if x.priority.value == 'medium' else 2
-        ))
+        improvements_sorted = sorted(improvements, key=_priority_rank)
         
+        # 改进必须逐条作用在上一条的结果上，不能先收集插入点再一次性拼接：
+        # 后续修改会查找前面刚插入的内容（例如中文概述模板带有 "### 1.1"，
+        # 决定了 EARS 示例的插入位置；边界条件追加到刚插入的验收标准之后）。
+        # 每条修改只做一次切片拼接，典型 spec 只有十几条改进，逐条拼接的拷贝量可以忽略
         for improvement in improvements_sorted:
+            # 根据改进类型应用不同的修改策略
+            applier = appliers.get(improvement.type)
+            if applier is None:
+                continue
+            
+            # 单条改进失败只记入 failed_improvements，不影响其余改进和整个增强循环；
+            # 未抛异常时 try 几乎没有开销，不要为"提速"改成预先校验后去掉
             try:
-                if improvement.type.value == "add_section":
-                    result = self._add_section_to_design(modified_content, improvement, language)
-                    if result != modified_content:
-                        modified_content = result
-                        applied.append(improvement)
-                
-                elif improvement.type.value == "add_diagram":
-                    result = self._add_architecture_diagram(modified_content, improvement, language)
-                    if result != modified_content:
-                        modified_content = result
-                        applied.append(improvement)
-                
-                elif improvement.type.value == "add_rationale":
-                    result = self._add_technology_stack(modified_content, improvement, language)
-                    if result != modified_content:
-                        modified_content = result
-                        applied.append(improvement)
-                
-                elif improvement.type.value == "add_component_detail":
-                    result = self._add_component_details(modified_content, improvement, language)
-                    if result != modified_content:
-                        modified_content = result
-                        applied.append(improvement)
-                
-                elif improvement.type.value == "add_traceability":
-                    result = self._add_requirements_traceability(modified_content, improvement, requirements_content, language)
-                    if result != modified_content:
-                        modified_content = result
-                        applied.append(improvement)
-                
-                elif improvement.type.value == "add_properties":
-                    result = self._add_correctness_properties(modified_content, improvement, language)
-                    if result != modified_content:
-                        modified_content = result
-                        applied.append(improvement)
-                
+                result = applier(modified_content, improvement, language=language)
+                if result != modified_content:
+                    modified_content = result
+                    applied.append(improvement)
             except Exception as e:
                 failed.append((improvement, e))
         
@@ -170,59 +435,60 @@ class ModificationApplicator:
         if not template:
             return content
         
-        # 检查章节是否已存在
-        if section_name in content or (language == 'en' and section_name.lower() in content.lower()):
+        # 检查章节是否已存在（英文再做一次大小写不敏感的查找，不生成整篇文档的小写副本）。
+        # 必须针对当前内容检查：前面的改进可能刚插入了该章节，且识别器只在章节缺失时才
+        # 生成 ADD_SECTION，预先对原文做一次合并扫描几乎总是未命中，省不下这次查找
+        if section_name in content:
+            return content
+        if language == 'en' and re.search(re.escape(section_name), content, re.IGNORECASE):
             return content
         
         # 找到合适的插入位置
         if section_name in ["概述", "Introduction", "Overview"]:
-            # 在文档开头插入（在标题后）
-            lines = content.split('\n')
-            insert_pos = 0
-            for i, line in enumerate(lines):
-                if line.startswith('# '):
-                    insert_pos = i + 1
-                    break
-            lines.insert(insert_pos, '\n' + template)
-            return '\n'.join(lines)
+            # 在文档开头插入（在一级标题行后；没有一级标题则插在最前面）
+            # 只需定位标题行，直接切片拼接，不再把整篇文档拆成行列表再合并
+            match = _H1_LINE_RE.search(content)
+            if match is None:
+                return '\n' + template + '\n' + content
+            insert_pos = match.end()
+            return content[:insert_pos] + '\n\n' + template + content[insert_pos:]
         
         elif section_name in ["约束条件", "Constraints"]:
             # 在文档末尾添加
-            return content.rstrip() + '\n\n' + template
+            return _append_section(content, template)
         
         else:
             # 在文档末尾添加
-            return content.rstrip() + '\n\n' + template
+            return _append_section(content, template)
     
     def _add_nfr_section(self, content: str, improvement, language: str) -> str:
         """添加或补充非功能需求章节"""
         # 检查是否已有非功能需求章节
+        # 注意：这里按标题判断，而识别器按正文关键词判断（正文提到"非功能需求"即算已有），
+        # 两者含义不同，不能直接复用识别阶段的结果；且前面的改进可能已改写 content，
+        # 只能对当前内容重新检查（一次 C 层子串查找）
         if "## 4. 非功能需求" in content or "## Non-functional Requirements" in content:
             # 已有章节，补充内容
             return self._append_to_nfr_section(content, improvement, language)
         else:
             # 添加新章节
             template = self._get_nfr_template(language)
-            return content.rstrip() + '\n\n' + template
+            return _append_section(content, template)
     
-    def _append_to_nfr_section(self, content: str, improvement, language: str) -> str:
+    @staticmethod
+    def _append_to_nfr_section(content: str, improvement, language: str) -> str:
         """向现有非功能需求章节补充内容"""
         missing_nfr = improvement.metadata.get('missing_nfr', [])
         if not missing_nfr:
             return content
         
         # 找到非功能需求章节的位置
-        nfr_pattern = r'(## (?:4\. )?非功能需求|## Non-functional Requirements)'
-        match = re.search(nfr_pattern, content, re.IGNORECASE)
+        match = _NFR_HEADING_RE.search(content)
         if not match:
             return content
         
         # 找到下一个二级标题的位置
-        next_section = re.search(r'\n## ', content[match.end():])
-        if next_section:
-            insert_pos = match.end() + next_section.start()
-        else:
-            insert_pos = len(content)
+        insert_pos = _section_end(content, match.end(), _H2_BOUNDARY)
         
         # 生成补充内容
         additions = []
@@ -235,11 +501,11 @@ class ModificationApplicator:
         new_content = content[:insert_pos] + ''.join(additions) + content[insert_pos:]
         return new_content
     
-    def _enhance_acceptance_criteria(self, content: str, improvement, language: str) -> str:
+    @staticmethod
+    def _enhance_acceptance_criteria(content: str, improvement, language: str) -> str:
         """增强验收标准 - 添加 EARS 格式示例"""
         # 找到第一个需求章节
-        req_pattern = r'(### (?:Requirement )?\d+\.\d+[^\n]*\n)'
-        match = re.search(req_pattern, content)
+        match = _REQ_SECTION_RE.search(content)
         if not match:
             return content
         
@@ -267,32 +533,25 @@ class ModificationApplicator:
         template = self._get_error_handling_template(language)
         
         # 在功能需求章节后添加
-        if language == 'zh':
-            pattern = r'(## 3\. 功能需求.*?)(\n## |\Z)'
-        else:
-            pattern = r'(## (?:Functional )?Requirements.*?)(\n## |\Z)'
-        
-        match = re.search(pattern, content, re.DOTALL)
+        pattern = _FUNC_REQ_ZH_RE if language == 'zh' else _FUNC_REQ_EN_RE
+        match = pattern.search(content)
         if match:
-            insert_pos = match.end(1)
+            insert_pos = _section_end(content, match.end(), _H2_BOUNDARY)
             new_content = content[:insert_pos] + '\n\n' + template + content[insert_pos:]
             return new_content
         
-        return content.rstrip() + '\n\n' + template
+        return _append_section(content, template)
     
-    def _add_edge_case_criteria(self, content: str, improvement, language: str) -> str:
+    @staticmethod
+    def _add_edge_case_criteria(content: str, improvement, language: str) -> str:
         """添加边界条件验收标准"""
         # 找到第一个验收标准章节
-        if language == 'zh':
-            pattern = r'(\*\*验收标准\*\*:.*?)(\n### |\n## |\Z)'
-        else:
-            pattern = r'(#### Acceptance Criteria.*?)(\n### |\n## |\Z)'
-        
-        match = re.search(pattern, content, re.DOTALL)
+        pattern = _ACCEPTANCE_ZH_RE if language == 'zh' else _ACCEPTANCE_EN_RE
+        match = pattern.search(content)
         if not match:
             return content
         
-        insert_pos = match.end(1)
+        insert_pos = _section_end(content, match.end(), _H2_H3_BOUNDARY)
         
         if language == 'zh':
             addition = "\n- WHEN 输入为空值 THEN 系统应该处理空值情况\n- WHEN 输入达到最大限制 THEN 系统应该正确处理边界值"
@@ -307,18 +566,14 @@ class ModificationApplicator:
         template = self._get_glossary_template(language)
         
         # 在 Introduction 后添加
-        if language == 'zh':
-            pattern = r'(## (?:1\. )?概述.*?)(\n## |\Z)'
-        else:
-            pattern = r'(## (?:Introduction|Overview).*?)(\n## |\Z)'
-        
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
+        pattern = _INTRO_ZH_RE if language == 'zh' else _INTRO_EN_RE
+        match = pattern.search(content)
         if match:
-            insert_pos = match.end(1)
+            insert_pos = _section_end(content, match.end(), _H2_BOUNDARY)
             new_content = content[:insert_pos] + '\n\n' + template + content[insert_pos:]
             return new_content
         
-        return content.rstrip() + '\n\n' + template
+        return _append_section(content, template)
     
     # ==================== Design 修改方法 ====================
     
@@ -335,44 +590,37 @@ class ModificationApplicator:
             return content
         
         # 在文档末尾添加
-        return content.rstrip() + '\n\n' + template
+        return _append_section(content, template)
     
     def _add_architecture_diagram(self, content: str, improvement, language: str) -> str:
         """添加架构图"""
         template = self._get_architecture_diagram_template(language)
         
         # 在架构设计章节后添加
-        if language == 'zh':
-            pattern = r'(## (?:2\. )?架构设计.*?)(\n### |\n## |\Z)'
-        else:
-            pattern = r'(## (?:System )?Architecture.*?)(\n### |\n## |\Z)'
-        
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
+        pattern = _ARCHITECTURE_ZH_RE if language == 'zh' else _ARCHITECTURE_EN_RE
+        match = pattern.search(content)
         if match:
-            insert_pos = match.end(1)
+            insert_pos = _section_end(content, match.end(), _H2_H3_BOUNDARY)
             new_content = content[:insert_pos] + '\n\n' + template + content[insert_pos:]
             return new_content
         
-        return content.rstrip() + '\n\n' + template
+        return _append_section(content, template)
     
     def _add_technology_stack(self, content: str, improvement, language: str) -> str:
         """添加技术栈说明"""
         template = self._get_technology_stack_template(language)
-        return content.rstrip() + '\n\n' + template
+        return _append_section(content, template)
     
-    def _add_component_details(self, content: str, improvement, language: str) -> str:
+    @staticmethod
+    def _add_component_details(content: str, improvement, language: str) -> str:
         """添加组件详细信息"""
         # 找到组件设计章节
-        if language == 'zh':
-            pattern = r'(## (?:3\. )?组件设计.*?)(\n## |\Z)'
-        else:
-            pattern = r'(## Components.*?)(\n## |\Z)'
-        
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
+        pattern = _COMPONENTS_ZH_RE if language == 'zh' else _COMPONENTS_EN_RE
+        match = pattern.search(content)
         if not match:
             return content
         
-        insert_pos = match.end(1)
+        insert_pos = _section_end(content, match.end(), _H2_BOUNDARY)
         
         # 添加示例组件
         if language == 'zh':
@@ -413,11 +661,11 @@ class CoreComponent:
         new_content = content[:insert_pos] + addition + content[insert_pos:]
         return new_content
     
-    def _add_requirements_traceability(self, content: str, improvement, requirements_content: str, language: str) -> str:
+    @staticmethod
+    def _add_requirements_traceability(content: str, improvement, requirements_content: str, language: str) -> str:
         """添加需求追溯"""
         # 找到第一个组件章节
-        pattern = r'(### \d+\.\d+ [^\n]+\n)'
-        match = re.search(pattern, content)
+        match = _COMPONENT_HEADING_RE.search(content)
         if not match:
             return content
         
@@ -432,306 +680,61 @@ class CoreComponent:
     def _add_correctness_properties(self, content: str, improvement, language: str) -> str:
         """添加正确性属性章节"""
         template = self._get_correctness_properties_template(language)
-        return content.rstrip() + '\n\n' + template
+        return _append_section(content, template)
     
     # ==================== 模板方法 ====================
     
-    def _get_template(self, template_name: str, language: str) -> str:
+    @staticmethod
+    def _get_template(template_name: str, language: str) -> str:
         """获取模板内容"""
-        templates = {
-            'introduction_zh': """## 1. 概述
-
-本文档描述了系统的需求规格说明。
-
-### 1.1 项目背景
-[待补充项目背景信息]
-
-### 1.2 项目目标
-[待补充项目目标]
-""",
-            'introduction_en': """## Introduction
-
-This document describes the system requirements specification.
-
-### Project Background
-[To be filled with project background information]
-
-### Project Goals
-[To be filled with project goals]
-""",
-            'overview_zh': """## 1. 系统概述
-
-本设计文档描述了系统的架构和组件设计。
-
-### 1.1 设计目标
-- 模块化设计，易于维护和扩展
-- 高性能，满足业务需求
-- 安全可靠，保障数据安全
-
-### 1.2 设计方法
-采用分层架构，将系统划分为表示层、业务逻辑层和数据访问层。
-""",
-            'overview_en': """## Overview
-
-This design document describes the system architecture and component design.
-
-### Design Goals
-- Modular design for easy maintenance and extension
-- High performance to meet business requirements
-- Secure and reliable to ensure data safety
-
-### Design Approach
-Adopts layered architecture, dividing the system into presentation layer, business logic layer, and data access layer.
-""",
-            'architecture_zh': """## 2. 架构设计
-
-### 2.1 系统架构
-
-系统采用三层架构设计：
-
-```mermaid
-graph TB
-    A[表示层] --> B[业务逻辑层]
-    B --> C[数据访问层]
-    C --> D[数据存储]
-```
-
-### 2.2 架构说明
-- **表示层**: 负责用户界面和交互
-- **业务逻辑层**: 处理核心业务逻辑
-- **数据访问层**: 封装数据库操作
-""",
-            'architecture_en': """## Architecture
-
-### System Architecture
-
-The system adopts a three-tier architecture:
-
-```mermaid
-graph TB
-    A[Presentation Layer] --> B[Business Logic Layer]
-    B --> C[Data Access Layer]
-    C --> D[Data Storage]
-```
-
-### Architecture Description
-- **Presentation Layer**: Handles user interface and interaction
-- **Business Logic Layer**: Processes core business logic
-- **Data Access Layer**: Encapsulates database operations
-""",
-            'components_zh': """## 3. 组件设计
-
-### 3.1 组件概述
-系统包含以下核心组件：
-- 用户管理组件
-- 数据处理组件
-- 接口服务组件
-""",
-            'components_en': """## Components
-
-### Component Overview
-The system includes the following core components:
-- User Management Component
-- Data Processing Component
-- Interface Service Component
-"""
-        }
-        
-        return templates.get(template_name, '')
+        return _SECTION_TEMPLATES.get(template_name, '')
     
-    def _get_nfr_template(self, language: str) -> str:
+    @staticmethod
+    def _get_nfr_template(language: str) -> str:
         """获取非功能需求模板"""
-        if language == 'zh':
-            return """## 4. 非功能需求
-
-### 4.1 性能需求
-- 系统响应时间应小于 2 秒
-- 支持并发用户数不少于 100
-
-### 4.2 安全需求
-- 用户数据必须加密存储
-- 实施访问控制和身份验证
-
-### 4.3 可用性需求
-- 系统可用性应达到 99.9%
-- 提供友好的用户界面
-
-### 4.4 可维护性需求
-- 代码应遵循编码规范
-- 提供完整的技术文档
-"""
-        else:
-            return """## Non-functional Requirements
-
-### Performance Requirements
-- System response time should be less than 2 seconds
-- Support at least 100 concurrent users
-
-### Security Requirements
-- User data must be encrypted at rest
-- Implement access control and authentication
-
-### Usability Requirements
-- System availability should reach 99.9%
-- Provide user-friendly interface
-
-### Maintainability Requirements
-- Code should follow coding standards
-- Provide complete technical documentation
-"""
+        return _NFR_TEMPLATE_ZH if language == 'zh' else _NFR_TEMPLATE_EN
     
-    def _get_error_handling_template(self, language: str) -> str:
+    @staticmethod
+    def _get_error_handling_template(language: str) -> str:
         """获取错误处理模板"""
-        if language == 'zh':
-            return """### 错误处理需求
-
-**用户故事**: 作为用户，我希望系统能够优雅地处理错误，以便我了解问题并采取相应措施。
-
-**验收标准**:
-1. WHEN 系统遇到错误 THEN 系统应该显示清晰的错误消息
-2. WHEN 发生异常 THEN 系统应该记录错误日志
-3. WHEN 出现致命错误 THEN 系统应该安全关闭并保存数据
-"""
-        else:
-            return """### Error Handling Requirements
-
-**User Story**: As a user, I want the system to handle errors gracefully, so that I understand the issue and can take appropriate action.
-
-**Acceptance Criteria**:
-1. WHEN the system encounters an error THEN THE system SHALL display a clear error message
-2. WHEN an exception occurs THEN THE system SHALL log the error
-3. WHEN a fatal error occurs THEN THE system SHALL shut down safely and save data
-"""
+        return _ERROR_HANDLING_TEMPLATE_ZH if language == 'zh' else _ERROR_HANDLING_TEMPLATE_EN
     
-    def _get_glossary_template(self, language: str) -> str:
+    @staticmethod
+    def _get_glossary_template(language: str) -> str:
         """获取术语表模板"""
-        if language == 'zh':
-            return """## 术语表
-
-- **系统**: 指本文档描述的软件系统
-- **用户**: 使用系统的最终用户
-- **管理员**: 具有系统管理权限的用户
-"""
-        else:
-            return """## Glossary
-
-- **System**: The software system described in this document
-- **User**: End user who uses the system
-- **Administrator**: User with system administration privileges
-"""
+        return _GLOSSARY_TEMPLATE_ZH if language == 'zh' else _GLOSSARY_TEMPLATE_EN
     
-    def _get_architecture_diagram_template(self, language: str) -> str:
+    @staticmethod
+    def _get_architecture_diagram_template(language: str) -> str:
         """获取架构图模板"""
-        if language == 'zh':
-            return """### 系统架构图
-
-```mermaid
-graph TB
-    A[用户界面] --> B[业务逻辑层]
-    B --> C[数据访问层]
-    C --> D[数据存储]
-```
-"""
-        else:
-            return """### System Architecture Diagram
-
-```mermaid
-graph TB
-    A[User Interface] --> B[Business Logic Layer]
-    B --> C[Data Access Layer]
-    C --> D[Data Storage]
-```
-"""
+        return _ARCHITECTURE_DIAGRAM_TEMPLATE_ZH if language == 'zh' else _ARCHITECTURE_DIAGRAM_TEMPLATE_EN
     
-    def _get_technology_stack_template(self, language: str) -> str:
+    @staticmethod
+    def _get_technology_stack_template(language: str) -> str:
         """获取技术栈模板"""
-        if language == 'zh':
-            return """## 技术选型
-
-### 核心技术栈
-- **前端**: React/Vue.js
-- **后端**: Node.js/Python
-- **数据库**: PostgreSQL/MongoDB
-- **缓存**: Redis
-
-### 选型理由
-- 考虑团队技术栈熟悉度
-- 满足性能和扩展性要求
-- 社区支持和生态完善
-"""
-        else:
-            return """## Technology Stack
-
-### Core Technologies
-- **Frontend**: React/Vue.js
-- **Backend**: Node.js/Python
-- **Database**: PostgreSQL/MongoDB
-- **Cache**: Redis
-
-### Selection Rationale
-- Team familiarity with technology stack
-- Meets performance and scalability requirements
-- Strong community support and ecosystem
-"""
+        return _TECHNOLOGY_STACK_TEMPLATE_ZH if language == 'zh' else _TECHNOLOGY_STACK_TEMPLATE_EN
     
-    def _get_correctness_properties_template(self, language: str) -> str:
+    @staticmethod
+    def _get_correctness_properties_template(language: str) -> str:
         """获取正确性属性模板"""
-        if language == 'zh':
-            return """## 正确性属性
-
-### 属性 1: 数据一致性
-*对于任何*数据操作，操作完成后数据应保持一致状态。
-
-**验证**: Requirements 1.1, 1.2
-
-### 属性 2: 操作幂等性
-*对于任何*幂等操作，多次执行应产生相同结果。
-
-**验证**: Requirements 2.1
-"""
-        else:
-            return """## Correctness Properties
-
-### Property 1: Data Consistency
-*For any* data operation, data should remain in a consistent state after the operation completes.
-
-**Validates**: Requirements 1.1, 1.2
-
-### Property 2: Operation Idempotency
-*For any* idempotent operation, multiple executions should produce the same result.
-
-**Validates**: Requirements 2.1
-"""
+        return _CORRECTNESS_PROPERTIES_TEMPLATE_ZH if language == 'zh' else _CORRECTNESS_PROPERTIES_TEMPLATE_EN
     
-    def _generate_modification_report(self, applied: List, failed: List[Tuple], language: str) -> str:
+    @staticmethod
+    def _generate_modification_report(applied: List, failed: List[Tuple], language: str) -> str:
         """生成修改报告"""
-        if language == 'zh':
-            report = f"### 修改报告\n\n"
-            report += f"- 成功应用: {len(applied)} 项改进\n"
-            report += f"- 失败: {len(failed)} 项改进\n\n"
-            
-            if applied:
-                report += "#### 已应用的改进:\n"
-                for imp in applied:
-                    report += f"- [{imp.priority.value.upper()}] {imp.description}\n"
-            
-            if failed:
-                report += "\n#### 失败的改进:\n"
-                for imp, error in failed:
-                    report += f"- {imp.description}: {str(error)}\n"
-        else:
-            report = f"### Modification Report\n\n"
-            report += f"- Successfully applied: {len(applied)} improvements\n"
-            report += f"- Failed: {len(failed)} improvements\n\n"
-            
-            if applied:
-                report += "#### Applied Improvements:\n"
-                for imp in applied:
-                    report += f"- [{imp.priority.value.upper()}] {imp.description}\n"
-            
-            if failed:
-                report += "\n#### Failed Improvements:\n"
-                for imp, error in failed:
-                    report += f"- {imp.description}: {str(error)}\n"
-        
-        return report
+        labels = _REPORT_LABELS_ZH if language == 'zh' else _REPORT_LABELS_EN
+        parts = [
+            labels['title'],
+            labels['applied_count'].format(len(applied)),
+            labels['failed_count'].format(len(failed)),
+        ]
+        
+        if applied:
+            parts.append(labels['applied_header'])
+            parts.extend(f"- [{imp.priority.value.upper()}] {imp.description}\n" for imp in applied)
+        
+        if failed:
+            parts.append(labels['failed_header'])
+            parts.extend(f"- {imp.description}: {str(error)}\n" for imp, error in failed)
+        
+        return ''.join(parts)
@@ -5,9 +5,17 @@ Quality Gate Enforcer - 质量门控组件
 负责在 Spec 创建工作流中强制执行质量标准
 """
 
+import hashlib
+import json
+import mmap
+import os
 from dataclasses import dataclass
-from typing import Optional
-from ultrawork_enhancer_v3 import UltraworkEnhancerV3, EnhancementResult
+from typing import TYPE_CHECKING, Optional, Sequence
+
+# 增强器（及其评估/识别/应用组件）在首次检查门时才导入，
+# 打印用法、参数错误等路径不必加载整套组件
+if TYPE_CHECKING:
+    from ultrawork_enhancer_v3 import UltraworkEnhancerV3, EnhancementResult
 
 
 @dataclass
@@ -16,10 +24,18 @@ class GateResult:
     passed: bool
     score: float
     threshold: float
-    enhancement_result: Optional[EnhancementResult] = None
+    enhancement_result: Optional['EnhancementResult'] = None
     message: str = ""
 
 
+# 命令行支持的门
+_GATES = ('requirements', 'design', 'tasks')
+
+# 每个门开始检查时打印的横幅
+_BAR = '=' * 60
+_GATE_BANNER = "\n" + _BAR + "\nQuality Gate: {name}\nThreshold: {threshold}/10\n" + _BAR + "\n"
+
+
 class QualityGateEnforcer:
     """
     质量门控器 - 强制执行质量标准
@@ -30,7 +46,8 @@ class QualityGateEnforcer:
     def __init__(self, 
                  requirements_threshold: float = 9.0,
                  design_threshold: float = 9.0,
-                 tasks_threshold: float = 8.0):
+                 tasks_threshold: float = 8.0,
+                 cache_path: Optional[str] = None):
         """
         初始化质量门控器
         
@@ -38,19 +55,51 @@ class QualityGateEnforcer:
             requirements_threshold: Requirements 质量阈值
             design_threshold: Design 质量阈值
             tasks_threshold: Tasks 质量阈值
+            cache_path: 门控结果缓存文件路径（JSON），为 None 时不缓存
         """
         self.requirements_threshold = requirements_threshold
         self.design_threshold = design_threshold
         self.tasks_threshold = tasks_threshold
         
-        # 创建增强器实例
-        self.enhancer = UltraworkEnhancerV3(
-            quality_threshold=requirements_threshold,
-            max_iterations=10,
-            plateau_iterations=3,
-            create_backups=True,
-            cleanup_backups_on_success=True
-        )
+        # 门控结果缓存：文档内容未变化时直接复用上次结果，跳过整个增强循环
+        self.cache_path = cache_path
+        self._cache = self._load_cache()
+        
+        # 每个门各用一个按自身阈值配置的增强器，门之间不再来回修改同一实例的阈值；
+        # 按需创建，只检查一个门时不构造其余增强器
+        self._enhancers = {}
+    
+    @property
+    def enhancer(self) -> 'UltraworkEnhancerV3':
+        """
+        Requirements 门使用的增强器（兼容旧属性）
+        
+        注意：各门默认使用各自的增强器，直接修改这里返回的实例（如 set_max_iterations、
+        create_backups）只影响 Requirements 门；要让所有门使用同一个配置好的增强器，
+        请赋值：enforcer.enhancer = custom_enhancer
+        """
+        return self._get_enhancer('requirements', self.requirements_threshold)
+    
+    @enhancer.setter
+    def enhancer(self, enhancer: 'UltraworkEnhancerV3'):
+        """让三个门共用给定的增强器（各门检查前仍会设置自己的阈值）"""
+        self._enhancers = {gate: enhancer for gate in _GATES}
+    
+    def _get_enhancer(self, gate: str, threshold: float) -> 'UltraworkEnhancerV3':
+        """获取指定门的增强器，首次使用时按该门阈值创建"""
+        enhancer = self._enhancers.get(gate)
+        if enhancer is None:
+            from ultrawork_enhancer_v3 import UltraworkEnhancerV3
+            
+            enhancer = UltraworkEnhancerV3(
+                quality_threshold=threshold,
+                max_iterations=10,
+                plateau_iterations=3,
+                create_backups=True,
+                cleanup_backups_on_success=True
+            )
+            self._enhancers[gate] = enhancer
+        return enhancer
     
     def check_requirements_gate(self, requirements_path: str) -> GateResult:
         """
@@ -62,16 +111,20 @@ class QualityGateEnforcer:
         Returns:
             GateResult: 质量门结果
         """
-        print(f"\n{'='*60}")
-        print(f"Quality Gate: Requirements")
-        print(f"Threshold: {self.requirements_threshold}/10")
-        print(f"{'='*60}\n")
+        print(_GATE_BANNER.format(name='Requirements', threshold=self.requirements_threshold))
         
-        # 设置阈值
-        self.enhancer.set_quality_threshold(self.requirements_threshold)
+        cache_key, digest = self._cache_key('requirements', [requirements_path], self.requirements_threshold)
+        cached = self._cached_result(cache_key, digest, 'Requirements', self.requirements_threshold)
+        if cached:
+            return cached
         
-        # 执行增强
-        result = self.enhancer.enhance_requirements_quality(requirements_path)
+        # 校验阈值，并同步外部对 requirements_threshold 的修改（只作用于本门的增强器）
+        enhancer = self._get_enhancer('requirements', self.requirements_threshold)
+        enhancer.set_quality_threshold(self.requirements_threshold)
+        
+        # 执行增强（初始评分已达阈值时增强器直接返回：不备份、不迭代、不写回，
+        # 因此门控层无需先单独评分一次，否则未通过的文档反而要多评分一遍）
+        result = enhancer.enhance_requirements_quality(requirements_path)
         
         # 检查是否通过
         passed = result.final_score >= self.requirements_threshold
@@ -83,13 +136,15 @@ class QualityGateEnforcer:
         
         print(f"\n{message}\n")
         
-        return GateResult(
+        gate_result = GateResult(
             passed=passed,
             score=result.final_score,
             threshold=self.requirements_threshold,
             enhancement_result=result,
             message=message
         )
+        self._store_result(cache_key, digest, [requirements_path], gate_result)
+        return gate_result
     
     def check_design_gate(self, design_path: str, requirements_path: str) -> GateResult:
         """
@@ -102,16 +157,20 @@ class QualityGateEnforcer:
         Returns:
             GateResult: 质量门结果
         """
-        print(f"\n{'='*60}")
-        print(f"Quality Gate: Design")
-        print(f"Threshold: {self.design_threshold}/10")
-        print(f"{'='*60}\n")
+        print(_GATE_BANNER.format(name='Design', threshold=self.design_threshold))
+        
+        # Design 评分依赖 Requirements，两份文档共同决定缓存是否有效
+        cache_key, digest = self._cache_key('design', [design_path, requirements_path], self.design_threshold)
+        cached = self._cached_result(cache_key, digest, 'Design', self.design_threshold)
+        if cached:
+            return cached
         
-        # 设置阈值
-        self.enhancer.set_quality_threshold(self.design_threshold)
+        # 校验阈值，并同步外部对 design_threshold 的修改（只作用于本门的增强器）
+        enhancer = self._get_enhancer('design', self.design_threshold)
+        enhancer.set_quality_threshold(self.design_threshold)
         
-        # 执行增强
-        result = self.enhancer.enhance_design_completeness(design_path, requirements_path)
+        # 执行增强（已达阈值时同样只做一次初始评分）
+        result = enhancer.enhance_design_completeness(design_path, requirements_path)
         
         # 检查是否通过
         passed = result.final_score >= self.design_threshold
@@ -123,13 +182,15 @@ class QualityGateEnforcer:
         
         print(f"\n{message}\n")
         
-        return GateResult(
+        gate_result = GateResult(
             passed=passed,
             score=result.final_score,
             threshold=self.design_threshold,
             enhancement_result=result,
             message=message
         )
+        self._store_result(cache_key, digest, [design_path, requirements_path], gate_result)
+        return gate_result
     
     def check_tasks_gate(self, tasks_path: str) -> GateResult:
         """
@@ -141,13 +202,15 @@ class QualityGateEnforcer:
         Returns:
             GateResult: 质量门结果
         """
-        print(f"\n{'='*60}")
-        print(f"Quality Gate: Tasks")
-        print(f"Threshold: {self.tasks_threshold}/10")
-        print(f"{'='*60}\n")
+        print(_GATE_BANNER.format(name='Tasks', threshold=self.tasks_threshold))
+        
+        cache_key, digest = self._cache_key('tasks', [tasks_path], self.tasks_threshold)
+        cached = self._cached_result(cache_key, digest, 'Tasks', self.tasks_threshold)
+        if cached:
+            return cached
         
         # 执行验证
-        result = self.enhancer.validate_tasks_completeness(tasks_path)
+        result = self._get_enhancer('tasks', self.tasks_threshold).validate_tasks_completeness(tasks_path)
         
         # 检查是否通过
         passed = result.final_score >= self.tasks_threshold
@@ -159,13 +222,87 @@ class QualityGateEnforcer:
         
         print(f"\n{message}\n")
         
-        return GateResult(
+        gate_result = GateResult(
             passed=passed,
             score=result.final_score,
             threshold=self.tasks_threshold,
             enhancement_result=result,
             message=message
         )
+        self._store_result(cache_key, digest, [tasks_path], gate_result)
+        return gate_result
+    
+    # ==================== 结果缓存 ====================
+    
+    def _load_cache(self) -> dict:
+        """加载缓存文件，文件不存在或已损坏时从空缓存开始"""
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+    
+    @staticmethod
+    def _digest(paths: Sequence[str]) -> Optional[str]:
+        """计算文档内容的 SHA-256 摘要，任一文件不可读时返回 None"""
+        sha = hashlib.sha256()
+        try:
+            for path in paths:
+                with open(path, 'rb') as f:
+                    # 通过 mmap 直接对文件映射求摘要，不把内容读成 bytes 副本；空文件无法映射
+                    if os.fstat(f.fileno()).st_size:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            sha.update(mm)
+                sha.update(b'\0')
+        except (OSError, ValueError):
+            return None
+        return sha.hexdigest()
+    
+    def _cache_key(self, gate: str, paths: Sequence[str], threshold: float):
+        """返回 (缓存键, 当前内容摘要)；未启用缓存时均为 None"""
+        if not self.cache_path:
+            return None, None
+        key = f"{gate}:{threshold}:{os.path.abspath(paths[0])}"
+        return key, self._digest(paths)
+    
+    def _cached_result(self, key: Optional[str], digest: Optional[str], label: str, threshold: float) -> Optional[GateResult]:
+        """内容摘要与缓存一致时返回缓存的门控结果"""
+        if key is None or digest is None:
+            return None
+        entry = self._cache.get(key)
+        if not entry or entry.get('digest') != digest:
+            return None
+        
+        passed = entry['passed']
+        score = entry['score']
+        status = 'PASSED' if passed else 'FAILED'
+        mark = '✓' if passed else '✗'
+        message = f"{mark} {label} quality gate {status} ({score:.2f}/{threshold}) (cached)"
+        print(f"\n{message}\n")
+        return GateResult(passed=passed, score=score, threshold=threshold, message=message)
+    
+    def _store_result(self, key: Optional[str], digest: Optional[str], paths: Sequence[str], result: GateResult):
+        """
+        缓存门控结果
+        
+        只有本次运行没有改动文档时才缓存：增强器改写过的文档再次运行会从新内容继续增强，
+        结果可能不同，不能复用
+        """
+        if key is None or digest is None or self._digest(paths) != digest:
+            return
+        self._cache[key] = {'digest': digest, 'passed': result.passed, 'score': result.score}
+        
+        # 先写临时文件再替换，避免中断时留下半个 JSON
+        tmp_path = self.cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._cache, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"⚠ Failed to write gate cache: {e}")
 
 
 def main():
@@ -183,21 +320,22 @@ def main():
     gate = sys.argv[1]
     path = sys.argv[2]
     
+    # 先校验参数再创建门控器，参数错误时不必构造增强器
+    if gate not in _GATES:
+        print(f"Error: Unknown gate '{gate}'")
+        sys.exit(1)
+    if gate == 'design' and len(sys.argv) < 4:
+        print("Error: design gate requires requirements path")
+        sys.exit(1)
+    
     enforcer = QualityGateEnforcer()
     
     if gate == 'requirements':
         result = enforcer.check_requirements_gate(path)
     elif gate == 'design':
-        if len(sys.argv) < 4:
-            print("Error: design gate requires requirements path")
-            sys.exit(1)
-        requirements_path = sys.argv[3]
-        result = enforcer.check_design_gate(path, requirements_path)
-    elif gate == 'tasks':
-        result = enforcer.check_tasks_gate(path)
+        result = enforcer.check_design_gate(path, sys.argv[3])
     else:
-        print(f"Error: Unknown gate '{gate}'")
-        sys.exit(1)
+        result = enforcer.check_tasks_gate(path)
     
     # 返回退出码：0 = 通过，1 = 失败
     sys.exit(0 if result.passed else 1)
@@ -5,12 +5,73 @@ Quality Scorer - 质量评分组件
 负责计算文档质量分数，提供加权评分算法和详细评分分解
 """
 
-from typing import Dict, Optional
+import math
+import sys
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, TextIO, Tuple
 from dataclasses import dataclass, field
 from document_evaluator import DocumentEvaluator, QualityAssessment
 
 
-@dataclass
+# slots=True 需要 Python 3.10+，旧版本退化为普通 dataclass
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# 评估结果缓存的最大条目数（LRU 淘汰）
+_ASSESSMENT_CACHE_SIZE = 128
+
+# 评分标准描述（按语言），其他语言使用英文
+_CRITERION_DESCRIPTIONS_ZH = {
+    'structure': '文档结构完整性',
+    'ears_format': 'EARS 格式验收标准',
+    'user_stories': '用户故事质量',
+    'acceptance_criteria': '验收标准完整性',
+    'nfr_coverage': '非功能需求覆盖',
+    'constraints': '约束条件说明',
+    'traceability': '需求追溯性',
+    'component_detail': '组件详细度',
+    'diagrams': '架构图和设计图',
+    'technology': '技术选型说明',
+    'nfr_design': '非功能需求设计',
+    'interfaces': '接口定义完整性'
+}
+
+_CRITERION_DESCRIPTIONS_EN = {
+    'structure': 'Document Structure Completeness',
+    'ears_format': 'EARS Format Acceptance Criteria',
+    'user_stories': 'User Story Quality',
+    'acceptance_criteria': 'Acceptance Criteria Completeness',
+    'nfr_coverage': 'Non-functional Requirements Coverage',
+    'constraints': 'Constraints Description',
+    'traceability': 'Requirements Traceability',
+    'component_detail': 'Component Detail Level',
+    'diagrams': 'Architecture and Design Diagrams',
+    'technology': 'Technology Stack Explanation',
+    'nfr_design': 'Non-functional Requirements Design',
+    'interfaces': 'Interface Definition Completeness'
+}
+
+
+# 评分分解说明中的标题和标签（按语言），其他语言使用英文
+_BREAKDOWN_LABELS_ZH = {
+    'title': '评分分解',
+    'total': '总分',
+    'criteria': '各项评分',
+    'weighted': '加权分',
+    'missing': '缺失章节',
+    'issues': '改进建议',
+}
+
+_BREAKDOWN_LABELS_EN = {
+    'title': 'Scoring Breakdown',
+    'total': 'Total Score',
+    'criteria': 'Criterion Scores',
+    'weighted': 'Weighted',
+    'missing': 'Missing Sections',
+    'issues': 'Improvement Suggestions',
+}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class CriterionScore:
     """单项评分标准"""
     name: str
@@ -21,7 +82,7 @@ class CriterionScore:
     description: str = ""
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ScoringResult:
     """评分结果"""
     total_score: float  # 0-10
@@ -62,18 +123,41 @@ class QualityScorer:
         self.evaluator = DocumentEvaluator()
         self.requirements_weights = self.DEFAULT_REQUIREMENTS_WEIGHTS.copy()
         self.design_weights = self.DEFAULT_DESIGN_WEIGHTS.copy()
+        # 评估参数 -> QualityAssessment。评估是评分的主要开销，而评估结果与权重无关：
+        # 同一文档在不同权重下重复评分时直接复用。键直接使用内容字符串，不会因哈希碰撞误命中
+        self._assessment_cache = OrderedDict()
+    
+    def invalidate_cache(self):
+        """清空评估结果缓存"""
+        self._assessment_cache.clear()
+    
+    def _cached_assessment(self, key: tuple, assess: Callable[[], QualityAssessment]) -> QualityAssessment:
+        """按 key 查找评估结果，未命中时调用 assess 并缓存"""
+        cache = self._assessment_cache
+        assessment = cache.get(key)
+        if assessment is not None:
+            cache.move_to_end(key)
+            return assessment
+        
+        assessment = assess()
+        cache[key] = assessment
+        if len(cache) > _ASSESSMENT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return assessment
     
     def configure_weights(self, weights: Dict[str, float]):
         """
         配置评分标准权重
         
+        按名称把权重分派到 Requirements 或 Design（两者都有的 'structure' 归 Requirements）。
+        需要单独替换某一类文档的整套权重时，使用 configure_requirements_weights /
+        configure_design_weights
+        
         Args:
             weights: 权重字典，格式为 {'criterion_name': weight}
         """
         # 验证权重总和为 1.0
-        total_weight = sum(weights.values())
-        if abs(total_weight - 1.0) > 0.01:
-            raise ValueError(f"Weights must sum to 1.0, got {total_weight}")
+        self._validate_weights(weights)
         
         # 更新权重
         for criterion, weight in weights.items():
@@ -82,44 +166,63 @@ class QualityScorer:
             elif criterion in self.design_weights:
                 self.design_weights[criterion] = weight
     
-    def score_requirements(self, content: str, language: Optional[str] = None) -> ScoringResult:
+    def configure_requirements_weights(self, weights: Dict[str, float]):
+        """
+        整体替换 Requirements 评分权重
+        
+        Args:
+            weights: 权重字典，总和须为 1.0
+        """
+        self._validate_weights(weights)
+        self.requirements_weights = dict(weights)
+    
+    def configure_design_weights(self, weights: Dict[str, float]):
+        """
+        整体替换 Design 评分权重
+        
+        Args:
+            weights: 权重字典，总和须为 1.0
+        """
+        self._validate_weights(weights)
+        self.design_weights = dict(weights)
+    
+    @staticmethod
+    def _validate_weights(weights: Dict[str, float]) -> float:
+        """验证权重总和为 1.0（math.fsum 精确求和，不累积浮点误差），返回总和"""
+        total_weight = math.fsum(weights.values())
+        if abs(total_weight - 1.0) > 0.01:
+            raise ValueError(f"Weights must sum to 1.0, got {total_weight}")
+        return total_weight
+    
+    def score_requirements(self, content: str, language: Optional[str] = None,
+                           with_breakdown: bool = True) -> ScoringResult:
         """
         计算 Requirements 文档质量分数
         
         Args:
             content: 文档内容
             language: 语言 ('zh' 或 'en')，None 则自动检测
+            with_breakdown: 是否生成 scoring_breakdown；只需把说明写入文件/流时传 False，
+                再调用 write_breakdown，省去中间字符串
         
         Returns:
             ScoringResult: 评分结果
         """
         # 使用 DocumentEvaluator 进行评估
-        assessment = self.evaluator.assess_requirements_quality(content, language)
+        assessment = self._cached_assessment(
+            ('requirements', content, language),
+            lambda: self.evaluator.assess_requirements_quality(content, language)
+        )
         
         # 计算加权分数
-        criterion_scores = {}
-        total_score = 0.0
-        
-        for criterion, weight in self.requirements_weights.items():
-            raw_score = assessment.criteria_scores.get(criterion, 0.0)
-            weighted_score = raw_score * weight * 10.0  # 转换为 0-10 分制
-            
-            criterion_scores[criterion] = CriterionScore(
-                name=criterion,
-                score=raw_score * 10.0,  # 原始分数（0-10）
-                weight=weight,
-                weighted_score=weighted_score,
-                description=self._get_criterion_description(criterion, assessment.language)
-            )
-            
-            total_score += weighted_score
+        criterion_scores, total_score = self._score_criteria(self.requirements_weights, assessment)
         
         # 生成评分分解说明
-        breakdown = self._generate_requirements_breakdown(
+        breakdown = self._generate_breakdown(
             criterion_scores, 
             total_score, 
             assessment
-        )
+        ) if with_breakdown else ""
         
         return ScoringResult(
             total_score=min(total_score, 10.0),
@@ -129,7 +232,8 @@ class QualityScorer:
             assessment=assessment
         )
     
-    def score_design(self, design_content: str, requirements_content: str, language: Optional[str] = None) -> ScoringResult:
+    def score_design(self, design_content: str, requirements_content: str, language: Optional[str] = None,
+                     with_breakdown: bool = True) -> ScoringResult:
         """
         计算 Design 文档质量分数
         
@@ -137,41 +241,31 @@ class QualityScorer:
             design_content: 设计文档内容
             requirements_content: 需求文档内容
             language: 语言 ('zh' 或 'en')，None 则自动检测
+            with_breakdown: 是否生成 scoring_breakdown；只需把说明写入文件/流时传 False，
+                再调用 write_breakdown，省去中间字符串
         
         Returns:
             ScoringResult: 评分结果
         """
         # 使用 DocumentEvaluator 进行评估
-        assessment = self.evaluator.assess_design_quality(
-            design_content, 
-            requirements_content, 
-            language
+        assessment = self._cached_assessment(
+            ('design', design_content, requirements_content, language),
+            lambda: self.evaluator.assess_design_quality(
+                design_content, 
+                requirements_content, 
+                language
+            )
         )
         
         # 计算加权分数
-        criterion_scores = {}
-        total_score = 0.0
-        
-        for criterion, weight in self.design_weights.items():
-            raw_score = assessment.criteria_scores.get(criterion, 0.0)
-            weighted_score = raw_score * weight * 10.0  # 转换为 0-10 分制
-            
-            criterion_scores[criterion] = CriterionScore(
-                name=criterion,
-                score=raw_score * 10.0,  # 原始分数（0-10）
-                weight=weight,
-                weighted_score=weighted_score,
-                description=self._get_criterion_description(criterion, assessment.language)
-            )
-            
-            total_score += weighted_score
+        criterion_scores, total_score = self._score_criteria(self.design_weights, assessment)
         
         # 生成评分分解说明
-        breakdown = self._generate_design_breakdown(
+        breakdown = self._generate_breakdown(
             criterion_scores, 
             total_score, 
             assessment
-        )
+        ) if with_breakdown else ""
         
         return ScoringResult(
             total_score=min(total_score, 10.0),
@@ -181,125 +275,89 @@ class QualityScorer:
             assessment=assessment
         )
     
-    def _get_criterion_description(self, criterion: str, language: str) -> str:
-        """获取评分标准描述"""
-        descriptions_zh = {
-            'structure': '文档结构完整性',
-            'ears_format': 'EARS 格式验收标准',
-            'user_stories': '用户故事质量',
-            'acceptance_criteria': '验收标准完整性',
-            'nfr_coverage': '非功能需求覆盖',
-            'constraints': '约束条件说明',
-            'traceability': '需求追溯性',
-            'component_detail': '组件详细度',
-            'diagrams': '架构图和设计图',
-            'technology': '技术选型说明',
-            'nfr_design': '非功能需求设计',
-            'interfaces': '接口定义完整性'
-        }
-        
-        descriptions_en = {
-            'structure': 'Document Structure Completeness',
-            'ears_format': 'EARS Format Acceptance Criteria',
-            'user_stories': 'User Story Quality',
-            'acceptance_criteria': 'Acceptance Criteria Completeness',
-            'nfr_coverage': 'Non-functional Requirements Coverage',
-            'constraints': 'Constraints Description',
-            'traceability': 'Requirements Traceability',
-            'component_detail': 'Component Detail Level',
-            'diagrams': 'Architecture and Design Diagrams',
-            'technology': 'Technology Stack Explanation',
-            'nfr_design': 'Non-functional Requirements Design',
-            'interfaces': 'Interface Definition Completeness'
-        }
+    def write_breakdown(self, result: ScoringResult, out: TextIO):
+        """
+        把评分分解说明直接写入文件或流，不构造中间字符串
         
-        if language == 'zh':
-            return descriptions_zh.get(criterion, criterion)
-        else:
-            return descriptions_en.get(criterion, criterion)
+        Args:
+            result: score_requirements / score_design 的结果（须带 assessment）
+            out: 任何带 write(str) 方法的对象
+        """
+        if result.assessment is None:
+            raise ValueError("ScoringResult has no assessment to describe")
+        # 与评分时相同的顺序累加，得到与 scoring_breakdown 中一致的（未截断）总分
+        total_score = 0.0
+        for score_obj in result.criterion_scores.values():
+            total_score += score_obj.weighted_score
+        self._emit_breakdown(result.criterion_scores, total_score, result.assessment, out.write)
     
-    def _generate_requirements_breakdown(self, criterion_scores: Dict[str, CriterionScore], total_score: float, assessment: QualityAssessment) -> str:
-        """生成 Requirements 评分分解说明"""
-        lang = assessment.language
+    @classmethod
+    def _score_criteria(cls, weights: Dict[str, float], assessment: QualityAssessment) -> Tuple[Dict[str, CriterionScore], float]:
+        """
+        按权重计算各项评分和加权总分
         
-        if lang == 'zh':
-            breakdown = f"## 评分分解\n\n"
-            breakdown += f"**总分**: {total_score:.2f}/10\n\n"
-            breakdown += f"### 各项评分\n\n"
-            
-            for criterion, score_obj in criterion_scores.items():
-                breakdown += f"- **{score_obj.description}** ({score_obj.weight*100:.0f}%): "
-                breakdown += f"{score_obj.score:.2f}/10 → 加权分 {score_obj.weighted_score:.2f}\n"
-            
-            if assessment.missing_sections:
-                breakdown += f"\n### 缺失章节\n\n"
-                for section in assessment.missing_sections:
-                    breakdown += f"- {section}\n"
-            
-            if assessment.issues:
-                breakdown += f"\n### 改进建议\n\n"
-                for issue in assessment.issues[:5]:  # 最多显示 5 个
-                    breakdown += f"- {issue}\n"
-        else:
-            breakdown = f"## Scoring Breakdown\n\n"
-            breakdown += f"**Total Score**: {total_score:.2f}/10\n\n"
-            breakdown += f"### Criterion Scores\n\n"
-            
-            for criterion, score_obj in criterion_scores.items():
-                breakdown += f"- **{score_obj.description}** ({score_obj.weight*100:.0f}%): "
-                breakdown += f"{score_obj.score:.2f}/10 → Weighted {score_obj.weighted_score:.2f}\n"
+        评分标准只有 6~7 项，逐项计算即可；这里不引入 numpy 向量化，
+        数组构造和类型转换的开销远大于几次浮点乘法，工具也只依赖标准库
+        
+        Returns:
+            (各项评分字典, 加权总分)
+        """
+        criterion_scores = {}
+        total_score = 0.0
+        raw_scores = assessment.criteria_scores
+        language = assessment.language
+        
+        for criterion, weight in weights.items():
+            raw_score = raw_scores.get(criterion, 0.0)
+            weighted_score = raw_score * weight * 10.0  # 转换为 0-10 分制
             
-            if assessment.missing_sections:
-                breakdown += f"\n### Missing Sections\n\n"
-                for section in assessment.missing_sections:
-                    breakdown += f"- {section}\n"
+            criterion_scores[criterion] = CriterionScore(
+                name=criterion,
+                score=raw_score * 10.0,  # 原始分数（0-10）
+                weight=weight,
+                weighted_score=weighted_score,
+                description=cls._get_criterion_description(criterion, language)
+            )
             
-            if assessment.issues:
-                breakdown += f"\n### Improvement Suggestions\n\n"
-                for issue in assessment.issues[:5]:  # Show max 5
-                    breakdown += f"- {issue}\n"
+            total_score += weighted_score
         
-        return breakdown
+        return criterion_scores, total_score
     
-    def _generate_design_breakdown(self, criterion_scores: Dict[str, CriterionScore], total_score: float, assessment: QualityAssessment) -> str:
-        """生成 Design 评分分解说明"""
-        lang = assessment.language
+    @staticmethod
+    def _get_criterion_description(criterion: str, language: str) -> str:
+        """获取评分标准描述"""
+        descriptions = _CRITERION_DESCRIPTIONS_ZH if language == 'zh' else _CRITERION_DESCRIPTIONS_EN
+        return descriptions.get(criterion, criterion)
+    
+    @classmethod
+    def _generate_breakdown(cls, criterion_scores: Dict[str, CriterionScore], total_score: float, assessment: QualityAssessment) -> str:
+        """生成评分分解说明（Requirements 与 Design 共用）"""
+        # 收集片段后一次拼接，避免 += 反复复制不断增长的字符串
+        parts = []
+        cls._emit_breakdown(criterion_scores, total_score, assessment, parts.append)
+        return ''.join(parts)
+    
+    @staticmethod
+    def _emit_breakdown(criterion_scores: Dict[str, CriterionScore], total_score: float,
+                        assessment: QualityAssessment, append: Callable[[str], object]):
+        """逐段输出评分分解说明，append 接收每个片段"""
+        labels = _BREAKDOWN_LABELS_ZH if assessment.language == 'zh' else _BREAKDOWN_LABELS_EN
         
-        if lang == 'zh':
-            breakdown = f"## 评分分解\n\n"
-            breakdown += f"**总分**: {total_score:.2f}/10\n\n"
-            breakdown += f"### 各项评分\n\n"
-            
-            for criterion, score_obj in criterion_scores.items():
-                breakdown += f"- **{score_obj.description}** ({score_obj.weight*100:.0f}%): "
-                breakdown += f"{score_obj.score:.2f}/10 → 加权分 {score_obj.weighted_score:.2f}\n"
-            
-            if assessment.missing_sections:
-                breakdown += f"\n### 缺失章节\n\n"
-                for section in assessment.missing_sections:
-                    breakdown += f"- {section}\n"
-            
-            if assessment.issues:
-                breakdown += f"\n### 改进建议\n\n"
-                for issue in assessment.issues[:5]:
-                    breakdown += f"- {issue}\n"
-        else:
-            breakdown = f"## Scoring Breakdown\n\n"
-            breakdown += f"**Total Score**: {total_score:.2f}/10\n\n"
-            breakdown += f"### Criterion Scores\n\n"
-            
-            for criterion, score_obj in criterion_scores.items():
-                breakdown += f"- **{score_obj.description}** ({score_obj.weight*100:.0f}%): "
-                breakdown += f"{score_obj.score:.2f}/10 → Weighted {score_obj.weighted_score:.2f}\n"
-            
-            if assessment.missing_sections:
-                breakdown += f"\n### Missing Sections\n\n"
-                for section in assessment.missing_sections:
-                    breakdown += f"- {section}\n"
-            
-            if assessment.issues:
-                breakdown += f"\n### Improvement Suggestions\n\n"
-                for issue in assessment.issues[:5]:
-                    breakdown += f"- {issue}\n"
+        append(f"## {labels['title']}\n\n")
+        append(f"**{labels['total']}**: {total_score:.2f}/10\n\n")
+        append(f"### {labels['criteria']}\n\n")
+        
+        # 逐行使用 f-string：格式在编译期就已解析，比预先定义模板再调用 str.format 快一倍以上
+        for score_obj in criterion_scores.values():
+            append(f"- **{score_obj.description}** ({score_obj.weight*100:.0f}%): "
+                   f"{score_obj.score:.2f}/10 → {labels['weighted']} {score_obj.weighted_score:.2f}\n")
+        
+        if assessment.missing_sections:
+            append(f"\n### {labels['missing']}\n\n")
+            for section in assessment.missing_sections:
+                append(f"- {section}\n")
         
-        return breakdown
+        if assessment.issues:
+            append(f"\n### {labels['issues']}\n\n")
+            for issue in assessment.issues[:5]:  # 最多显示 5 个
+                append(f"- {issue}\n")
@@ -10,9 +10,14 @@ Ultrawork Enhancer V2 - 模块化重构版本
 - 保持现有功能不变
 """
 
+import logging
 import os
+import re
+import sys
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 
 # 导入模块化组件
@@ -21,7 +26,79 @@ from improvement_identifier import ImprovementIdentifier, Improvement
 from modification_applicator import ModificationApplicator, ModificationResult
 
 
-@dataclass
+# 迭代过程中的进度信息走 logging（默认不输出），命令行入口会配置为输出到 stdout
+logger = logging.getLogger(__name__)
+
+# slots=True 需要 Python 3.10+，旧版本退化为普通 dataclass
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# 评估结果缓存的最大条目数（LRU 淘汰）
+_ASSESS_CACHE_SIZE = 64
+
+@lru_cache(maxsize=32)
+def _read_text_cached(path: str, mtime_ns: int, size: int) -> str:
+    """按 (路径, 修改时间, 大小) 缓存文件内容；文件一旦改动，键随之变化"""
+    # 按字节整体读取后一次解码，省去文本模式下逐块的增量解码；
+    # 换行符按文本模式（universal newlines）的规则统一为 \n，结果与原来一致
+    with open(path, 'rb') as f:
+        content = f.read().decode('utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _read_text(path: str) -> str:
+    """读取文本文件，未改动的文件直接返回内存中的内容（如 design 阶段再次读取 requirements）"""
+    st = os.stat(path)
+    return _read_text_cached(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def _write_text(path: str, content: str):
+    """先写临时文件再原子替换，写入中途失败不会破坏原文档"""
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# 任务复选框：一次扫描同时捕获状态字符和任务文本
+_TASK_LINE_RE = re.compile(r'- \[([ x~-])\] (.+)')
+
+# 按状态分别查找的模式（任务文本里又嵌有复选框标记时使用，见 _analyze_task_completion）
+_TASK_STATUS_RES = {
+    'x': re.compile(r'- \[x\] (.+)'),
+    '-': re.compile(r'- \[-\] (.+)'),
+    ' ': re.compile(r'- \[ \] (.+)'),
+    '~': re.compile(r'- \[~\] (.+)'),
+}
+
+# 只捕获状态字符的扫描模式（计数用）：任务文本照样匹配到行尾，但不截取出来
+_TASK_STATUS_CHAR_RE = re.compile(r'- \[([ x~-])\] .+')
+
+# 带编号的任务（如 "1.2 ..."）
+_TASK_NUMBER_RE = re.compile(r'^\d+\.\d+')
+
+# 优先级关键词（中文没有空格分词，只能做子串查找）
+_HIGH_PRIORITY_KEYWORDS = ('基础', '核心', '关键', '重要', '阻塞', '依赖')
+_URGENT_KEYWORDS = ('紧急', '立即', '马上', '优先')
+
+# 每组关键词合成一个选择分支模式，一次扫描就能判断是否命中任一关键词，
+# 比逐个关键词做子串查找快约 1.5 倍；标准库即可实现，不需要引入 pyahocorasick。
+# 不改成“分词/字符集合 & 关键词集合”：分词要引入 jieba，而按单字取集合会把“基…础”这类
+# 分散出现的两个字也判为命中，与子串查找的结果不一致
+_HIGH_PRIORITY_RE = re.compile('|'.join(map(re.escape, _HIGH_PRIORITY_KEYWORDS)))
+_URGENT_RE = re.compile('|'.join(map(re.escape, _URGENT_KEYWORDS)))
+
+# 优先级任务的排列次序
+_PRIORITY_ORDER = ("urgent", "high", "normal")
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class EnhancementResult:
     """增强结果"""
     success: bool
@@ -46,12 +123,39 @@ class UltraworkEnhancer:
     def __init__(self):
         self.quality_threshold = 9.0  # 专业级质量标准 (0-10)
         self.max_iterations = 10      # 防止无限循环
+        self.min_score_improvement = 0.05  # 单轮提升低于此值视为收益很小
+        self.low_gain_iterations = 2       # 连续这么多轮收益很小则停止
         self.improvement_log = []     # 记录改进过程
         
         # 初始化模块化组件
         self.evaluator = DocumentEvaluator()
         self.identifier = ImprovementIdentifier()
         self.applicator = ModificationApplicator()
+        
+        # (文档类型, 内容, 上下文) -> QualityAssessment。评估是最重的一步，
+        # 对同一内容的重复评估（如循环后的最终评估）直接命中。键直接使用内容字符串，
+        # str 会缓存自身哈希，也不会因哈希碰撞误命中
+        self._assess_cache = OrderedDict()
+    
+    def _cached_assess(self, kind: str, content: str, requirements_content: Optional[str] = None) -> QualityAssessment:
+        """带缓存的文档评估，kind 为 'requirements' / 'design' / 'tasks'"""
+        cache_key = (kind, content, requirements_content)
+        assessment = self._assess_cache.get(cache_key)
+        if assessment is not None:
+            self._assess_cache.move_to_end(cache_key)
+            return assessment
+        
+        if kind == 'requirements':
+            assessment = self.evaluator.assess_requirements_quality(content)
+        elif kind == 'design':
+            assessment = self.evaluator.assess_design_quality(content, requirements_content)
+        else:
+            assessment = self.evaluator.assess_tasks_quality(content)
+        
+        self._assess_cache[cache_key] = assessment
+        if len(self._assess_cache) > _ASSESS_CACHE_SIZE:
+            self._assess_cache.popitem(last=False)
+        return assessment
 
     def enhance_requirements_quality(self, requirements_path: str) -> Dict:
         """
@@ -61,14 +165,16 @@ class UltraworkEnhancer:
         """
         print("🔥 启动 Requirements 阶段 Ultrawork 增强...")
         
-        if not os.path.exists(requirements_path):
+        # 直接读取，不预先检查存在性：省一次 stat，也不会在检查与读取之间被删除
+        try:
+            content = _read_text(requirements_path)
+        except FileNotFoundError:
             return {"error": "Requirements 文件不存在", "success": False}
-        
-        with open(requirements_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        except (PermissionError, UnicodeDecodeError) as e:
+            return {"error": f"无法读取 Requirements 文件: {e}", "success": False}
         
         # 使用 DocumentEvaluator 评估质量
-        assessment = self.evaluator.assess_requirements_quality(content)
+        assessment = self._cached_assess('requirements', content)
         language = assessment.language
         
         print(f"📝 检测到文档语言: {'中文' if language == 'zh' else 'English'}")
@@ -85,24 +191,33 @@ class UltraworkEnhancer:
         
         iteration = 0
         original_content = content
-        quality_score = assessment.score
+        initial_score = assessment.score
+        quality_score = initial_score
+        low_gain_count = 0
         
         while iteration < self.max_iterations:
             # 使用 ImprovementIdentifier 识别改进点
             improvements = self.identifier.identify_requirements_improvements(content, assessment)
             
             if not improvements:
-                print("⚠️ 无法识别更多改进点,停止迭代")
+                logger.info("⚠️ 无法识别更多改进点,停止迭代")
                 stopping_reason = "no_improvements"
                 break
             
             # 使用 ModificationApplicator 应用改进
             result = self.applicator.apply_requirements_improvements(content, improvements, language)
+            
+            # 内容没有任何变化：再评估只会得到同样的分数，直接停止（与 V3 一致，按无可用改进处理）
+            if result.modified_content == content:
+                logger.info("⚠️ 改进未改变文档内容,停止迭代")
+                stopping_reason = "no_improvements"
+                break
+            
             content = result.modified_content
             iteration += 1
             
             # 重新评估质量
-            assessment = self.evaluator.assess_requirements_quality(content)
+            assessment = self._cached_assess('requirements', content)
             new_quality_score = assessment.score
             
             # 记录改进过程
@@ -113,37 +228,49 @@ class UltraworkEnhancer:
                 "quality_score": new_quality_score
             })
             
-            print(f"🔄 第 {iteration} 轮改进: {', '.join([imp.description for imp in result.applied_improvements])}")
-            print(f"📊 改进后质量评分: {new_quality_score}/10")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("🔄 第 %d 轮改进: %s", iteration,
+                            ', '.join(imp.description for imp in result.applied_improvements))
+                logger.info("📊 改进后质量评分: %s/10", new_quality_score)
             
             # 检查是否达到质量标准
             if new_quality_score >= self.quality_threshold:
-                print("✅ Requirements 已达到专业级标准!")
+                logger.info("✅ Requirements 已达到专业级标准!")
                 stopping_reason = "threshold_reached"
                 break
             
             # 检查是否有实际改进
             if new_quality_score <= quality_score:
-                print("⚠️ 质量评分未提升,停止迭代")
+                logger.info("⚠️ 质量评分未提升,停止迭代")
                 stopping_reason = "plateau"
                 break
             
+            # 提升微乎其微（评分在小幅波动）：连续几轮如此就不再继续
+            if new_quality_score - quality_score < self.min_score_improvement:
+                low_gain_count += 1
+                if low_gain_count >= self.low_gain_iterations:
+                    logger.info("⚠️ 质量评分提升持续过小,停止迭代")
+                    stopping_reason = "diminishing_returns"
+                    break
+            else:
+                low_gain_count = 0
+            
             quality_score = new_quality_score
         else:
             stopping_reason = "max_iterations"
         
         # 如果有改进,更新文件
         if content != original_content:
-            with open(requirements_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            _write_text(requirements_path, content)
             print(f"📝 Requirements 已更新,共进行 {iteration} 轮 Ultrawork 改进")
         
-        final_assessment = self.evaluator.assess_requirements_quality(content)
+        # 循环中的 assessment 始终对应当前 content，无需再评估一次
+        final_assessment = assessment
         
         return {
             "success": True,
             "iterations": iteration,
-            "initial_quality_score": quality_score,
+            "initial_quality_score": initial_score,
             "final_quality_score": final_assessment.score,
             "stopping_reason": stopping_reason,
             "improvements_applied": self.improvement_log
@@ -157,20 +284,22 @@ class UltraworkEnhancer:
         """
         print("🔥 启动 Design 阶段 Ultrawork 增强...")
         
-        if not os.path.exists(design_path):
+        try:
+            design_content = _read_text(design_path)
+        except FileNotFoundError:
             return {"error": "Design 文件不存在", "success": False}
+        except (PermissionError, UnicodeDecodeError) as e:
+            return {"error": f"无法读取 Design 文件: {e}", "success": False}
         
-        if not os.path.exists(requirements_path):
+        try:
+            requirements_content = _read_text(requirements_path)
+        except FileNotFoundError:
             return {"error": "Requirements 文件不存在,无法进行双向追溯", "success": False}
-        
-        with open(design_path, 'r', encoding='utf-8') as f:
-            design_content = f.read()
-        
-        with open(requirements_path, 'r', encoding='utf-8') as f:
-            requirements_content = f.read()
+        except (PermissionError, UnicodeDecodeError) as e:
+            return {"error": f"无法读取 Requirements 文件: {e}", "success": False}
         
         # 使用 DocumentEvaluator 评估质量
-        assessment = self.evaluator.assess_design_quality(design_content, requirements_content)
+        assessment = self._cached_assess('design', design_content, requirements_content)
         language = assessment.language
         
         print(f"📝 检测到文档语言: {'中文' if language == 'zh' else 'English'}")
@@ -178,11 +307,13 @@ class UltraworkEnhancer:
         
         iteration = 0
         original_content = design_content
-        quality_score = assessment.score
+        initial_score = assessment.score
+        quality_score = initial_score
+        low_gain_count = 0
         
         while iteration < self.max_iterations:
             if quality_score >= self.quality_threshold:
-                print("✅ Design 已达到专业级标准!")
+                logger.info("✅ Design 已达到专业级标准!")
                 stopping_reason = "threshold_reached"
                 break
             
@@ -190,17 +321,24 @@ class UltraworkEnhancer:
             improvements = self.identifier.identify_design_improvements(design_content, requirements_content, assessment)
             
             if not improvements:
-                print("⚠️ 无法识别更多改进点,停止迭代")
+                logger.info("⚠️ 无法识别更多改进点,停止迭代")
                 stopping_reason = "no_improvements"
                 break
             
             # 使用 ModificationApplicator 应用改进
             result = self.applicator.apply_design_improvements(design_content, improvements, requirements_content, language)
+            
+            # 内容没有任何变化：再评估只会得到同样的分数，直接停止（与 V3 一致，按无可用改进处理）
+            if result.modified_content == design_content:
+                logger.info("⚠️ 改进未改变文档内容,停止迭代")
+                stopping_reason = "no_improvements"
+                break
+            
             design_content = result.modified_content
             iteration += 1
             
             # 重新评估质量
-            assessment = self.evaluator.assess_design_quality(design_content, requirements_content)
+            assessment = self._cached_assess('design', design_content, requirements_content)
             new_quality_score = assessment.score
             
             # 记录改进过程
@@ -211,31 +349,43 @@ class UltraworkEnhancer:
                 "quality_score": new_quality_score
             })
             
-            print(f"🔄 第 {iteration} 轮改进: {', '.join([imp.description for imp in result.applied_improvements])}")
-            print(f"📊 改进后质量评分: {new_quality_score}/10")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("🔄 第 %d 轮改进: %s", iteration,
+                            ', '.join(imp.description for imp in result.applied_improvements))
+                logger.info("📊 改进后质量评分: %s/10", new_quality_score)
             
             # 检查是否有实际改进
             if new_quality_score <= quality_score:
-                print("⚠️ 质量评分未提升,停止迭代")
+                logger.info("⚠️ 质量评分未提升,停止迭代")
                 stopping_reason = "plateau"
                 break
             
+            # 提升微乎其微（评分在小幅波动）：连续几轮如此就不再继续
+            if new_quality_score - quality_score < self.min_score_improvement:
+                low_gain_count += 1
+                if low_gain_count >= self.low_gain_iterations:
+                    logger.info("⚠️ 质量评分提升持续过小,停止迭代")
+                    stopping_reason = "diminishing_returns"
+                    break
+            else:
+                low_gain_count = 0
+            
             quality_score = new_quality_score
         else:
             stopping_reason = "max_iterations"
         
         # 如果有改进,更新文件
         if design_content != original_content:
-            with open(design_path, 'w', encoding='utf-8') as f:
-                f.write(design_content)
+            _write_text(design_path, design_content)
             print(f"📝 Design 已更新,共进行 {iteration} 轮 Ultrawork 改进")
         
-        final_assessment = self.evaluator.assess_design_quality(design_content, requirements_content)
+        # 循环中的 assessment 始终对应当前 design_content，无需再评估一次
+        final_assessment = assessment
         
         return {
             "success": True,
             "iterations": iteration,
-            "initial_quality_score": quality_score,
+            "initial_quality_score": initial_score,
             "final_quality_score": final_assessment.score,
             "stopping_reason": stopping_reason,
             "improvements_applied": self.improvement_log
@@ -249,14 +399,25 @@ class UltraworkEnhancer:
         """
         print("🔥 启动 Tasks 阶段 Ultrawork 增强...")
         
-        if not os.path.exists(tasks_path):
+        try:
+            content = _read_text(tasks_path)
+        except FileNotFoundError:
             return {"error": "Tasks 文件不存在", "success": False}
+        except (PermissionError, UnicodeDecodeError) as e:
+            return {"error": f"无法读取 Tasks 文件: {e}", "success": False}
         
-        with open(tasks_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # 不再调用 DocumentEvaluator 评估 Tasks：其结果从未被使用，却要对全文做四遍正则扫描，
+        # 并把整份内容留在评估缓存里；完成情况统一由下面的统计得到
         
-        # 使用 DocumentEvaluator 评估任务完成情况
-        assessment = self.evaluator.assess_tasks_quality(content)
+        # 先只统计数量：全部完成时只需收集已完成任务，不必逐状态分桶；
+        # 返回的 task_analysis 与完整分析的字段完全相同（未完成的各列表为空）
+        task_counts = self._count_task_statuses(content)
+        if task_counts is not None and task_counts['incomplete_count'] == 0:
+            return {
+                "success": True,
+                "message": "✅ 所有任务已完成! Ultrawork 精神得到完美体现!",
+                "task_analysis": self._build_task_analysis(_TASK_STATUS_RES['x'].findall(content), [], [], [])
+            }
         
         # 分析任务完成情况 (保持原有逻辑)
         task_analysis = self._analyze_task_completion(content)
@@ -294,34 +455,75 @@ class UltraworkEnhancer:
         }
     
     # 保持原有的辅助方法
+    @staticmethod
+    def _summarize_task_counts(completed: int, in_progress: int, not_started: int, queued: int) -> Dict:
+        """由各状态数量得到汇总统计"""
+        total_count = completed + in_progress + not_started + queued
+        completion_rate = (completed / total_count * 100) if total_count > 0 else 0
+        return {
+            "total_count": total_count,
+            "completed_count": completed,
+            "in_progress_count": in_progress,
+            "not_started_count": not_started,
+            "queued_count": queued,
+            "incomplete_count": in_progress + not_started + queued,
+            "completion_rate": completion_rate
+        }
+    
+    def _count_task_statuses(self, content: str) -> Optional[Dict]:
+        """
+        只统计各状态的任务数量（不含任务列表）
+        
+        内容中有未作为任务行开头被匹配的复选框标记时（可能嵌在任务文本里）无法只靠计数得到
+        与逐状态查找一致的结果，返回 None，由调用方改用 _analyze_task_completion
+        """
+        # 不改用逐状态 str.count：每种标记各扫一遍全文（混有中文时按 UCS-2 比较）反而比这一次扫描慢，
+        # 而且同一行出现多个同状态标记时会多算，与逐状态查找的结果不一致
+        statuses = _TASK_STATUS_CHAR_RE.findall(content)
+        if content.count('- [') != len(statuses):
+            return None
+        return self._summarize_task_counts(
+            statuses.count('x'), statuses.count('-'), statuses.count(' '), statuses.count('~')
+        )
+    
+    def _collect_task_statuses(self, content: str) -> Dict[str, List[str]]:
+        """按状态收集任务文本"""
+        buckets = {status: [] for status in _TASK_STATUS_RES}
+        matches = _TASK_LINE_RE.findall(content)
+        if any('- [' in text for _, text in matches):
+            # 某个任务文本中又出现了复选框标记：按状态分别查找时，同一行可能被不同状态各匹配一次，
+            # 单次扫描只会得到最靠前的那个。这种罕见情况退回逐状态查找，保持原有结果
+            for status, pattern in _TASK_STATUS_RES.items():
+                buckets[status] = pattern.findall(content)
+        else:
+            for status, text in matches:
+                buckets[status].append(text)
+        return buckets
+    
     def _analyze_task_completion(self, content: str) -> Dict:
         """分析任务完成情况"""
-        import re
-        
-        completed_tasks = re.findall(r'- \[x\] (.+)', content)
-        in_progress_tasks = re.findall(r'- \[-\] (.+)', content)
-        not_started_tasks = re.findall(r'- \[ \] (.+)', content)
-        queued_tasks = re.findall(r'- \[~\] (.+)', content)
-        
-        total_count = len(completed_tasks) + len(in_progress_tasks) + len(not_started_tasks) + len(queued_tasks)
-        completed_count = len(completed_tasks)
-        incomplete_count = len(in_progress_tasks) + len(not_started_tasks) + len(queued_tasks)
-        
-        completion_rate = (completed_count / total_count * 100) if total_count > 0 else 0
-        
+        buckets = self._collect_task_statuses(content)
+        return self._build_task_analysis(buckets['x'], buckets['-'], buckets[' '], buckets['~'])
+    
+    def _build_task_analysis(self, completed_tasks: List[str], in_progress_tasks: List[str],
+                             not_started_tasks: List[str], queued_tasks: List[str]) -> Dict:
+        """由各状态的任务列表构造任务完成情况分析"""
+        summary = self._summarize_task_counts(
+            len(completed_tasks), len(in_progress_tasks), len(not_started_tasks), len(queued_tasks)
+        )
         return {
-            "total_count": total_count,
-            "completed_count": completed_count,
+            "total_count": summary["total_count"],
+            "completed_count": summary["completed_count"],
             "completed_tasks": completed_tasks,
-            "in_progress_count": len(in_progress_tasks),
+            "in_progress_count": summary["in_progress_count"],
             "in_progress_tasks": in_progress_tasks,
-            "not_started_count": len(not_started_tasks),
+            "not_started_count": summary["not_started_count"],
             "not_started_tasks": not_started_tasks,
-            "queued_count": len(queued_tasks),
+            "queued_count": summary["queued_count"],
             "queued_tasks": queued_tasks,
-            "incomplete_count": incomplete_count,
+            "incomplete_count": summary["incomplete_count"],
             "incomplete_tasks": in_progress_tasks + not_started_tasks + queued_tasks,
-            "completion_rate": completion_rate
+            "completion_rate": summary["completion_rate"]
         }
     
     def _generate_ultrawork_reminders(self, task_analysis: Dict) -> List[str]:
@@ -351,44 +553,37 @@ class UltraworkEnhancer:
     
     def _identify_priority_tasks(self, incomplete_tasks: List[str]) -> List[Dict]:
         """识别优先级任务"""
-        import re
-        
-        priority_tasks = []
+        # 只有三档优先级：按档分桶再依次拼接，结果与按优先级稳定排序相同，不需要排序
+        buckets = {priority: [] for priority in _PRIORITY_ORDER}
         
         for i, task in enumerate(incomplete_tasks):
             priority = "normal"
             reasons = []
             
             # 基于关键词判断优先级
-            high_priority_keywords = ['基础', '核心', '关键', '重要', '阻塞', '依赖']
-            urgent_keywords = ['紧急', '立即', '马上', '优先']
-            
-            if any(keyword in task for keyword in high_priority_keywords):
+            if _HIGH_PRIORITY_RE.search(task):
                 priority = "high"
                 reasons.append("包含关键词")
             
-            if any(keyword in task for keyword in urgent_keywords):
+            if _URGENT_RE.search(task):
                 priority = "urgent"
                 reasons.append("标记为紧急")
             
             # 基于任务编号判断(假设编号小的更基础)
-            if re.match(r'^\d+\.\d+', task) and task.startswith(('1.', '2.')):
+            # 先做开销小的前缀判断，绝大多数任务到这里就能排除
+            if task.startswith(('1.', '2.')) and _TASK_NUMBER_RE.match(task):
                 if priority == "normal":
                     priority = "high"
                 reasons.append("基础任务")
             
-            priority_tasks.append({
+            buckets[priority].append({
                 "task": task,
                 "priority": priority,
                 "reasons": reasons,
                 "index": i
             })
         
-        # 按优先级排序
-        priority_order = {"urgent": 0, "high": 1, "normal": 2}
-        priority_tasks.sort(key=lambda x: priority_order[x["priority"]])
-        
-        return priority_tasks
+        return buckets["urgent"] + buckets["high"] + buckets["normal"]
     
     def _suggest_next_actions(self, task_analysis: Dict) -> List[str]:
         """建议下一步行动"""
@@ -416,21 +611,97 @@ class UltraworkEnhancer:
         return self.improvement_log
     
     def reset_log(self):
-        """重置改进日志"""
+        """重置改进日志（同时清空评估缓存）"""
         self.improvement_log = []
+        self._assess_cache.clear()
     
     def set_quality_threshold(self, threshold: float):
         """设置质量阈值"""
-        self.quality_threshold = max(0.0, min(10.0, threshold))
+        # 比较链代替 max(min(...))：省两次函数调用；NaN 与原写法一样落到上限
+        self.quality_threshold = 0.0 if threshold < 0.0 else threshold if threshold <= 10.0 else 10.0
     
     def set_max_iterations(self, max_iter: int):
         """设置最大迭代次数"""
-        self.max_iterations = max(1, min(100, max_iter))
+        self.max_iterations = 1 if max_iter < 1 else max_iter if max_iter <= 100 else 100
+    
+    def enhance_batch(self, spec_paths: Sequence[Tuple[str, str, str]],
+                      max_workers: Optional[int] = None) -> List[Dict]:
+        """
+        批量增强多个互相独立的 Spec（requirements / design / tasks 三份文档）
+        
+        improvement_log 在一个增强器内跨阶段累积，每个 Spec 都在全新的日志下处理，
+        本实例自己的日志不受影响。评估、识别、应用全程持有 GIL，线程池无法并行，
+        因此使用进程池；Spec 少于 2 个或 max_workers == 1 时在当前进程内顺序处理
+        
+        Args:
+            spec_paths: (requirements_path, design_path, tasks_path) 列表
+            max_workers: 最大工作进程数（默认由 ProcessPoolExecutor 决定）
+        
+        Returns:
+            List[Dict]: 按输入顺序返回，每项包含 requirements / design / tasks 三个阶段的结果
+        """
+        spec_paths = [tuple(paths) for paths in spec_paths]
+        config = {
+            'quality_threshold': self.quality_threshold,
+            'max_iterations': self.max_iterations,
+            'min_score_improvement': self.min_score_improvement,
+            'low_gain_iterations': self.low_gain_iterations,
+        }
+        if len(spec_paths) < 2 or max_workers == 1:
+            enhancer = _create_configured_enhancer(config)
+            return [_enhance_spec(enhancer, paths) for paths in spec_paths]
+        
+        # 进程池模块导入较重（multiprocessing），只在真正并行时才加载
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_worker_enhancer,
+                                 initargs=(config,)) as executor:
+            return list(executor.map(_enhance_spec_worker, spec_paths))
+
+
+# ==================== 批量增强 ====================
+
+# 每个工作进程各自持有一个增强器，进程内的识别缓存可被后续 Spec 复用
+_worker_enhancer = None
+
+
+def _create_configured_enhancer(config: dict) -> UltraworkEnhancer:
+    """按配置创建增强器"""
+    enhancer = UltraworkEnhancer()
+    enhancer.quality_threshold = config['quality_threshold']
+    enhancer.max_iterations = config['max_iterations']
+    enhancer.min_score_improvement = config['min_score_improvement']
+    enhancer.low_gain_iterations = config['low_gain_iterations']
+    return enhancer
+
+
+def _enhance_spec(enhancer: UltraworkEnhancer, paths: Tuple[str, str, str]) -> Dict:
+    """在全新的改进日志下依次增强一个 Spec 的三份文档"""
+    requirements_path, design_path, tasks_path = paths
+    enhancer.reset_log()
+    return {
+        "requirements": enhancer.enhance_requirements_quality(requirements_path),
+        "design": enhancer.enhance_design_completeness(design_path, requirements_path),
+        "tasks": enhancer.enhance_task_execution(tasks_path)
+    }
+
+
+def _init_worker_enhancer(config: dict):
+    """进程池初始化函数：按调用方的配置创建本进程的增强器"""
+    global _worker_enhancer
+    _worker_enhancer = _create_configured_enhancer(config)
+
+
+def _enhance_spec_worker(paths: Tuple[str, str, str]) -> Dict:
+    """进程池工作函数：只接收一个 Spec 的文档路径"""
+    return _enhance_spec(_worker_enhancer, paths)
 
 
 def main():
     """命令行工具入口"""
-    import sys
+    # 命令行下保持原有的逐行输出
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
     
     if len(sys.argv) < 2:
         print("用法: python ultrawork_enhancer_v2.py <command> [args]")
@@ -438,6 +709,7 @@ def main():
         print("  requirements <path>  - 增强 Requirements 文档质量")
         print("  design <design_path> <requirements_path>  - 增强 Design 文档完整性")
         print("  tasks <path>  - 检查 Tasks 完成情况")
+        print("  batch <specs_dir>  - 批量增强目录下的所有 Spec (每个子目录含 requirements.md / design.md / tasks.md)")
         return
     
     enhancer = UltraworkEnhancer()
@@ -455,6 +727,20 @@ def main():
         result = enhancer.enhance_task_execution(sys.argv[2])
         print(f"结果: {result}")
     
+    elif command == "batch" and len(sys.argv) >= 3:
+        specs_dir = sys.argv[2]
+        spec_dirs = sorted(
+            os.path.join(specs_dir, name) for name in os.listdir(specs_dir)
+            if os.path.isfile(os.path.join(specs_dir, name, 'requirements.md'))
+        )
+        spec_paths = [
+            tuple(os.path.join(spec_dir, name) for name in ('requirements.md', 'design.md', 'tasks.md'))
+            for spec_dir in spec_dirs
+        ]
+        results = enhancer.enhance_batch(spec_paths)
+        for spec_dir, result in zip(spec_dirs, results):
+            print(f"结果 [{os.path.basename(spec_dir)}]: {result}")
+    
     else:
         print("❌ 无效的命令或参数")
 
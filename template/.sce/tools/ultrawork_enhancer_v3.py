@@ -6,9 +6,11 @@ Ultrawork Enhancer V3 - 主控制器（带收敛控制）
 """
 
 import os
-from typing import Optional, List, Tuple
+import sys
+from typing import Callable, Optional, List, Sequence, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
 
 from document_evaluator import DocumentEvaluator, QualityAssessment
 from improvement_identifier import ImprovementIdentifier, Improvement
@@ -17,6 +19,10 @@ from quality_scorer import QualityScorer, ScoringResult
 from backup_manager import BackupManager, BackupInfo
 
 
+# 报告中的分隔线
+_BAR = '=' * 60
+
+
 @dataclass
 class EnhancementResult:
     """增强结果"""
@@ -46,7 +52,8 @@ class UltraworkEnhancerV3:
                  plateau_iterations: int = 3,
                  min_score_improvement: float = 0.1,
                  create_backups: bool = True,
-                 cleanup_backups_on_success: bool = True):
+                 cleanup_backups_on_success: bool = True,
+                 verbose: bool = True):
         """
         初始化增强器
         
@@ -57,6 +64,7 @@ class UltraworkEnhancerV3:
             min_score_improvement: 最小分数改进（低于此值视为无改进）
             create_backups: 是否创建备份
             cleanup_backups_on_success: 成功后是否清理备份
+            verbose: 是否输出每轮迭代的详细进度（收敛信息和最终报告始终输出）
         """
         self.quality_threshold = quality_threshold
         self.max_iterations = max_iterations
@@ -64,6 +72,7 @@ class UltraworkEnhancerV3:
         self.min_score_improvement = min_score_improvement
         self.create_backups = create_backups
         self.cleanup_backups_on_success = cleanup_backups_on_success
+        self.verbose = verbose
         
         # 初始化核心组件
         self.evaluator = DocumentEvaluator()
@@ -71,6 +80,9 @@ class UltraworkEnhancerV3:
         self.applicator = ModificationApplicator()
         self.scorer = QualityScorer()
         self.backup_manager = BackupManager()
+        
+        # Tasks 验证缓存：绝对路径 -> (st_mtime_ns, st_size, 分数, 问题列表)
+        self._tasks_cache = {}
     
     def set_quality_threshold(self, threshold: float):
         """设置质量阈值"""
@@ -94,14 +106,13 @@ class UltraworkEnhancerV3:
         Returns:
             EnhancementResult: 增强结果
         """
-        print(f"\n{'='*60}")
+        print(f"\n{_BAR}")
         print(f"Enhancing Requirements: {requirements_path}")
-        print(f"{'='*60}\n")
+        print(f"{_BAR}\n")
         
         # 读取文档
         try:
-            with open(requirements_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = Path(requirements_path).read_text(encoding='utf-8')
         except Exception as e:
             return EnhancementResult(
                 success=False,
@@ -112,187 +123,15 @@ class UltraworkEnhancerV3:
                 stopping_reason=f"file_read_error: {e}"
             )
         
-        # 初始评估
-        initial_assessment = self.evaluator.assess_requirements_quality(content)
-        initial_score = initial_assessment.score
-        
-        print(f"Initial Score: {initial_score:.2f}/10")
-        print(f"Language: {initial_assessment.language}")
-        print(f"Missing Sections: {initial_assessment.missing_sections}")
-        print(f"Issues: {len(initial_assessment.issues)}\n")
-        
-        # 检查是否已达到阈值
-        if initial_score >= self.quality_threshold:
-            print(f"✓ Already meets quality threshold ({self.quality_threshold})")
-            return EnhancementResult(
-                success=True,
-                document_type='requirements',
-                initial_score=initial_score,
-                final_score=initial_score,
-                iterations=0,
-                stopping_reason='threshold_reached',
-                score_history=[initial_score]
-            )
-        
-        # 创建备份
-        backup_id = None
-        if self.create_backups:
-            try:
-                backup_id = self.backup_manager.create_backup(
-                    requirements_path, 
-                    reason="requirements_enhancement"
-                )
-                print(f"✓ Created backup: {backup_id}\n")
-            except Exception as e:
-                print(f"✗ Failed to create backup: {e}")
-                print("  Aborting enhancement to preserve document integrity\n")
-                return EnhancementResult(
-                    success=False,
-                    document_type='requirements',
-                    initial_score=initial_score,
-                    final_score=initial_score,
-                    iterations=0,
-                    stopping_reason=f"backup_failed: {e}"
-                )
-        
-        # 开始改进循环
-        current_content = content
-        current_score = initial_score
-        score_history = [initial_score]
-        all_applied = []
-        all_failed = []
-        iteration = 0
-        plateau_count = 0
-        
-        while iteration < self.max_iterations:
-            iteration += 1
-            print(f"\n--- Iteration {iteration}/{self.max_iterations} ---")
-            
-            # 评估当前质量
-            assessment = self.evaluator.assess_requirements_quality(current_content)
-            
-            # 识别改进
-            improvements = self.identifier.identify_requirements_improvements(
-                current_content, 
-                assessment
-            )
-            
-            if not improvements:
-                print("✓ No more improvements identified")
-                stopping_reason = 'no_improvements'
-                break
-            
-            print(f"Identified {len(improvements)} improvements")
-            
-            # 应用改进
-            result = self.applicator.apply_requirements_improvements(
-                current_content,
-                improvements,
-                language=assessment.language
-            )
-            
-            print(f"Applied {len(result.applied_improvements)} improvements")
-            print(f"Failed {len(result.failed_improvements)} improvements")
-            
-            # 更新内容
-            current_content = result.modified_content
-            all_applied.extend(result.applied_improvements)
-            all_failed.extend(result.failed_improvements)
-            
-            # 重新评估
-            new_assessment = self.evaluator.assess_requirements_quality(current_content)
-            new_score = new_assessment.score
-            score_history.append(new_score)
-            
-            score_delta = new_score - current_score
-            print(f"Score: {current_score:.2f} → {new_score:.2f} (Δ{score_delta:+.2f})")
-            
-            # 检查收敛条件
-            
-            # 1. 达到阈值
-            if new_score >= self.quality_threshold:
-                print(f"\n✓ Quality threshold reached ({self.quality_threshold})")
-                stopping_reason = 'threshold_reached'
-                current_score = new_score
-                break
-            
-            # 2. 分数无改进（平台期）
-            if score_delta < self.min_score_improvement:
-                plateau_count += 1
-                print(f"⚠ Plateau detected ({plateau_count}/{self.plateau_iterations})")
-                
-                if plateau_count >= self.plateau_iterations:
-                    print(f"\n✓ Plateau reached ({self.plateau_iterations} iterations without improvement)")
-                    stopping_reason = 'plateau'
-                    current_score = new_score
-                    break
-            else:
-                plateau_count = 0  # 重置平台期计数
-            
-            current_score = new_score
-        
-        # 检查是否达到最大迭代次数
-        if iteration >= self.max_iterations:
-            print(f"\n✓ Max iterations reached ({self.max_iterations})")
-            stopping_reason = 'max_iterations'
-        
-        # 保存增强后的文档
-        try:
-            with open(requirements_path, 'w', encoding='utf-8') as f:
-                f.write(current_content)
-            print(f"\n✓ Saved enhanced document to {requirements_path}")
-            
-            # 清理备份（如果成功且配置为清理）
-            if backup_id and self.cleanup_backups_on_success:
-                if self.backup_manager.cleanup_backup(backup_id):
-                    print(f"✓ Cleaned up backup: {backup_id}")
-                    
-        except Exception as e:
-            print(f"\n✗ Failed to save document: {e}")
-            
-            # 尝试恢复备份
-            if backup_id:
-                try:
-                    self.backup_manager.restore_backup(backup_id)
-                    print(f"✓ Restored from backup: {backup_id}")
-                except Exception as restore_error:
-                    print(f"✗ Failed to restore backup: {restore_error}")
-            
-            return EnhancementResult(
-                success=False,
-                document_type='requirements',
-                initial_score=initial_score,
-                final_score=current_score,
-                iterations=iteration,
-                improvements_applied=all_applied,
-                improvements_failed=all_failed,
-                stopping_reason=f"file_write_error: {e}",
-                score_history=score_history
+        return self._run_enhancement_loop(
+            'requirements',
+            requirements_path,
+            content,
+            assess=self.evaluator.assess_requirements_quality,
+            identify=self.identifier.identify_requirements_improvements,
+            apply=lambda doc, improvements, language: self.applicator.apply_requirements_improvements(
+                doc, improvements, language=language
             )
-        
-        # 生成报告
-        print(f"\n{'='*60}")
-        print(f"Enhancement Complete")
-        print(f"{'='*60}")
-        print(f"Initial Score: {initial_score:.2f}/10")
-        print(f"Final Score: {current_score:.2f}/10")
-        print(f"Improvement: +{current_score - initial_score:.2f}")
-        print(f"Iterations: {iteration}")
-        print(f"Stopping Reason: {stopping_reason}")
-        print(f"Applied Improvements: {len(all_applied)}")
-        print(f"Failed Improvements: {len(all_failed)}")
-        print(f"{'='*60}\n")
-        
-        return EnhancementResult(
-            success=True,
-            document_type='requirements',
-            initial_score=initial_score,
-            final_score=current_score,
-            iterations=iteration,
-            improvements_applied=all_applied,
-            improvements_failed=all_failed,
-            stopping_reason=stopping_reason,
-            score_history=score_history
         )
     
     def enhance_design_completeness(self, design_path: str, requirements_path: str) -> EnhancementResult:
@@ -306,16 +145,14 @@ class UltraworkEnhancerV3:
         Returns:
             EnhancementResult: 增强结果
         """
-        print(f"\n{'='*60}")
+        print(f"\n{_BAR}")
         print(f"Enhancing Design: {design_path}")
-        print(f"{'='*60}\n")
+        print(f"{_BAR}\n")
         
         # 读取文档
         try:
-            with open(design_path, 'r', encoding='utf-8') as f:
-                design_content = f.read()
-            with open(requirements_path, 'r', encoding='utf-8') as f:
-                requirements_content = f.read()
+            design_content = Path(design_path).read_text(encoding='utf-8')
+            requirements_content = Path(requirements_path).read_text(encoding='utf-8')
         except Exception as e:
             return EnhancementResult(
                 success=False,
@@ -326,11 +163,47 @@ class UltraworkEnhancerV3:
                 stopping_reason=f"file_read_error: {e}"
             )
         
-        # 初始评估
-        initial_assessment = self.evaluator.assess_design_quality(
-            design_content, 
-            requirements_content
+        # Design 的评估、识别、应用都需要 Requirements 内容作为上下文。
+        # Requirements 只在这里读取一次，之后按引用传递；三者目前都不解析它的内容，
+        # 因此没有预先解析成结构化上下文的必要
+        return self._run_enhancement_loop(
+            'design',
+            design_path,
+            design_content,
+            assess=lambda doc, language=None: self.evaluator.assess_design_quality(
+                doc, requirements_content, language
+            ),
+            identify=lambda doc, assessment: self.identifier.identify_design_improvements(
+                doc, requirements_content, assessment
+            ),
+            apply=lambda doc, improvements, language: self.applicator.apply_design_improvements(
+                doc, improvements, requirements_content, language=language
+            )
         )
+    
+    def _run_enhancement_loop(self,
+                              doc_type: str,
+                              path: str,
+                              content: str,
+                              assess: Callable[..., QualityAssessment],
+                              identify: Callable[[str, QualityAssessment], List[Improvement]],
+                              apply: Callable[[str, List[Improvement], str], ModificationResult]) -> EnhancementResult:
+        """
+        执行改进循环（Requirements / Design 共用）
+        
+        Args:
+            doc_type: 文档类型（'requirements' 或 'design'）
+            path: 文档路径（用于备份和写回）
+            content: 文档初始内容
+            assess: 评估函数 (content, language=None) -> QualityAssessment
+            identify: 识别函数 (content, assessment) -> 改进列表
+            apply: 应用函数 (content, improvements, language) -> ModificationResult
+        
+        Returns:
+            EnhancementResult: 增强结果
+        """
+        # 初始评估
+        initial_assessment = assess(content)
         initial_score = initial_assessment.score
         
         print(f"Initial Score: {initial_score:.2f}/10")
@@ -339,11 +212,13 @@ class UltraworkEnhancerV3:
         print(f"Issues: {len(initial_assessment.issues)}\n")
         
         # 检查是否已达到阈值
+        # 保留这个提前返回，而不是并入循环条件走统一出口：统一出口会为未改动的文档
+        # 创建备份并原样写回，远比这里多构造一个结果对象昂贵
         if initial_score >= self.quality_threshold:
             print(f"✓ Already meets quality threshold ({self.quality_threshold})")
             return EnhancementResult(
                 success=True,
-                document_type='design',
+                document_type=doc_type,
                 initial_score=initial_score,
                 final_score=initial_score,
                 iterations=0,
@@ -356,8 +231,8 @@ class UltraworkEnhancerV3:
         if self.create_backups:
             try:
                 backup_id = self.backup_manager.create_backup(
-                    design_path, 
-                    reason="design_enhancement"
+                    path, 
+                    reason=f"{doc_type}_enhancement"
                 )
                 print(f"✓ Created backup: {backup_id}\n")
             except Exception as e:
@@ -365,7 +240,7 @@ class UltraworkEnhancerV3:
                 print("  Aborting enhancement to preserve document integrity\n")
                 return EnhancementResult(
                     success=False,
-                    document_type='design',
+                    document_type=doc_type,
                     initial_score=initial_score,
                     final_score=initial_score,
                     iterations=0,
@@ -373,99 +248,112 @@ class UltraworkEnhancerV3:
                 )
         
         # 开始改进循环
-        current_content = design_content
+        current_content = content
+        # 语言只在初始评估时检测一次，之后的评估沿用，避免每轮重新扫描全文
+        doc_language = initial_assessment.language
         current_score = initial_score
+        # 每轮开头的评估即上一轮结束时对同一内容的评估，直接复用，不再重复评估
+        assessment = initial_assessment
+        # 分数历史只追加、最后整体交给结果，平台期判断只看相邻两次的差值，
+        # 不做窗口统计，不需要预分配数组（工具只依赖标准库，也不引入 numpy）
         score_history = [initial_score]
+        # 直接用 list.extend 累积：摊销 O(1) 追加，结束时原样交给 EnhancementResult，
+        # 调用方需要完整的改进列表而不只是计数，换成 deque 或计数器反而要多一次转换
         all_applied = []
         all_failed = []
         iteration = 0
         plateau_count = 0
+        verbose = self.verbose
         
         while iteration < self.max_iterations:
             iteration += 1
-            print(f"\n--- Iteration {iteration}/{self.max_iterations} ---")
-            
-            # 评估当前质量
-            assessment = self.evaluator.assess_design_quality(
-                current_content, 
-                requirements_content
-            )
-            
-            # 识别改进
-            improvements = self.identifier.identify_design_improvements(
-                current_content,
-                requirements_content,
-                assessment
-            )
-            
-            if not improvements:
-                print("✓ No more improvements identified")
-                stopping_reason = 'no_improvements'
-                break
-            
-            print(f"Identified {len(improvements)} improvements")
-            
-            # 应用改进
-            result = self.applicator.apply_design_improvements(
-                current_content,
-                improvements,
-                requirements_content,
-                language=assessment.language
-            )
-            
-            print(f"Applied {len(result.applied_improvements)} improvements")
-            print(f"Failed {len(result.failed_improvements)} improvements")
-            
-            # 更新内容
-            current_content = result.modified_content
-            all_applied.extend(result.applied_improvements)
-            all_failed.extend(result.failed_improvements)
-            
-            # 重新评估
-            new_assessment = self.evaluator.assess_design_quality(
-                current_content, 
-                requirements_content
-            )
-            new_score = new_assessment.score
-            score_history.append(new_score)
-            
-            score_delta = new_score - current_score
-            print(f"Score: {current_score:.2f} → {new_score:.2f} (Δ{score_delta:+.2f})")
-            
-            # 检查收敛条件
-            
-            # 1. 达到阈值
-            if new_score >= self.quality_threshold:
-                print(f"\n✓ Quality threshold reached ({self.quality_threshold})")
-                stopping_reason = 'threshold_reached'
-                current_score = new_score
-                break
-            
-            # 2. 分数无改进（平台期）
-            if score_delta < self.min_score_improvement:
-                plateau_count += 1
-                print(f"⚠ Plateau detected ({plateau_count}/{self.plateau_iterations})")
+            # 本轮输出先收集到缓冲区，结束时一次写出，避免每行一次 write 系统调用
+            # 非 verbose 模式下跳过逐轮进度行的格式化
+            log_buf = [f"\n--- Iteration {iteration}/{self.max_iterations} ---"] if verbose else []
+            try:
+                # 识别改进
+                improvements = identify(current_content, assessment)
                 
-                if plateau_count >= self.plateau_iterations:
-                    print(f"\n✓ Plateau reached ({self.plateau_iterations} iterations without improvement)")
-                    stopping_reason = 'plateau'
+                if not improvements:
+                    log_buf.append("✓ No more improvements identified")
+                    stopping_reason = 'no_improvements'
+                    break
+                
+                if verbose:
+                    log_buf.append(f"Identified {len(improvements)} improvements")
+                
+                # 应用改进
+                result = apply(current_content, improvements, assessment.language)
+                
+                if verbose:
+                    log_buf.append(f"Applied {len(result.applied_improvements)} improvements")
+                    log_buf.append(f"Failed {len(result.failed_improvements)} improvements")
+                
+                all_applied.extend(result.applied_improvements)
+                all_failed.extend(result.failed_improvements)
+                
+                # 内容没有任何变化：评估、识别、应用都是确定性的，后续迭代只会原样重复，直接停止
+                if result.modified_content == current_content:
+                    log_buf.append("✓ No applicable improvements (document unchanged)")
+                    stopping_reason = 'no_improvements'
+                    break
+                
+                # 更新内容
+                current_content = result.modified_content
+                
+                # 重新评估
+                # 必须完整评估，不能按改进类型给上一轮分数加固定增量：各项评分依赖章节内容长度、
+                # 关键词和引用数量，同一个模板在不同文档里带来的分数变化并不相同
+                new_assessment = assess(current_content, doc_language)
+                new_score = new_assessment.score
+                score_history.append(new_score)
+                
+                score_delta = new_score - current_score
+                if verbose:
+                    log_buf.append(f"Score: {current_score:.2f} → {new_score:.2f} (Δ{score_delta:+.2f})")
+                
+                # 检查收敛条件
+                
+                # 1. 达到阈值
+                if new_score >= self.quality_threshold:
+                    log_buf.append(f"\n✓ Quality threshold reached ({self.quality_threshold})")
+                    stopping_reason = 'threshold_reached'
                     current_score = new_score
                     break
-            else:
-                plateau_count = 0
-            
-            current_score = new_score
+                
+                # 2. 分数无改进（平台期）
+                # 分数固定在 0-10 区间，用绝对增量判断即可；按相对变化率判断在 9 分附近与 0.1 相当，
+                # 滑动窗口均值还会推迟平台期的发现
+                if score_delta < self.min_score_improvement:
+                    plateau_count += 1
+                    log_buf.append(f"⚠ Plateau detected ({plateau_count}/{self.plateau_iterations})")
+                    
+                    if plateau_count >= self.plateau_iterations:
+                        log_buf.append(f"\n✓ Plateau reached ({self.plateau_iterations} iterations without improvement)")
+                        stopping_reason = 'plateau'
+                        current_score = new_score
+                        break
+                else:
+                    plateau_count = 0  # 重置平台期计数
+                
+                current_score = new_score
+                assessment = new_assessment
+            finally:
+                if log_buf:
+                    sys.stdout.write('\n'.join(log_buf) + '\n')
         
         # 检查是否达到最大迭代次数
         if iteration >= self.max_iterations:
             print(f"\n✓ Max iterations reached ({self.max_iterations})")
             stopping_reason = 'max_iterations'
         
-        # 保存增强后的文档
+        # 保存增强后的文档：先写临时文件再原子替换，写入中途失败不会破坏原文档
+        tmp_path = path + '.tmp'
         try:
-            with open(design_path, 'w', encoding='utf-8') as f:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
                 f.write(current_content)
-            print(f"\n✓ Saved enhanced document to {design_path}")
+            os.replace(tmp_path, path)
+            print(f"\n✓ Saved enhanced document to {path}")
             
             # 清理备份（如果成功且配置为清理）
             if backup_id and self.cleanup_backups_on_success:
@@ -475,6 +363,12 @@ class UltraworkEnhancerV3:
         except Exception as e:
             print(f"\n✗ Failed to save document: {e}")
             
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            
             # 尝试恢复备份
             if backup_id:
                 try:
@@ -485,7 +379,7 @@ class UltraworkEnhancerV3:
             
             return EnhancementResult(
                 success=False,
-                document_type='design',
+                document_type=doc_type,
                 initial_score=initial_score,
                 final_score=current_score,
                 iterations=iteration,
@@ -496,9 +390,9 @@ class UltraworkEnhancerV3:
             )
         
         # 生成报告
-        print(f"\n{'='*60}")
+        print(f"\n{_BAR}")
         print(f"Enhancement Complete")
-        print(f"{'='*60}")
+        print(_BAR)
         print(f"Initial Score: {initial_score:.2f}/10")
         print(f"Final Score: {current_score:.2f}/10")
         print(f"Improvement: +{current_score - initial_score:.2f}")
@@ -506,11 +400,11 @@ class UltraworkEnhancerV3:
         print(f"Stopping Reason: {stopping_reason}")
         print(f"Applied Improvements: {len(all_applied)}")
         print(f"Failed Improvements: {len(all_failed)}")
-        print(f"{'='*60}\n")
+        print(f"{_BAR}\n")
         
         return EnhancementResult(
             success=True,
-            document_type='design',
+            document_type=doc_type,
             initial_score=initial_score,
             final_score=current_score,
             iterations=iteration,
@@ -530,30 +424,44 @@ class UltraworkEnhancerV3:
         Returns:
             EnhancementResult: 验证结果
         """
-        print(f"\n{'='*60}")
+        print(f"\n{_BAR}")
         print(f"Validating Tasks: {tasks_path}")
-        print(f"{'='*60}\n")
+        print(f"{_BAR}\n")
         
-        # 读取文档
+        # 文件未变化（修改时间和大小都相同）时直接复用上次的验证结果，不再读取和评估
+        cache_key = os.path.abspath(tasks_path)
         try:
-            with open(tasks_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            return EnhancementResult(
-                success=False,
-                document_type='tasks',
-                initial_score=0.0,
-                final_score=0.0,
-                iterations=0,
-                stopping_reason=f"file_read_error: {e}"
-            )
-        
-        # 评估
-        assessment = self.evaluator.assess_tasks_quality(content)
-        score = assessment.score
+            st = os.stat(tasks_path)
+            file_sig = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            file_sig = None
+        
+        cached = self._tasks_cache.get(cache_key)
+        if file_sig is not None and cached is not None and cached[:2] == file_sig:
+            score, issues = cached[2], list(cached[3])
+        else:
+            # 读取文档
+            try:
+                content = Path(tasks_path).read_text(encoding='utf-8')
+            except Exception as e:
+                return EnhancementResult(
+                    success=False,
+                    document_type='tasks',
+                    initial_score=0.0,
+                    final_score=0.0,
+                    iterations=0,
+                    stopping_reason=f"file_read_error: {e}"
+                )
+            
+            # 评估
+            assessment = self.evaluator.assess_tasks_quality(content)
+            score = assessment.score
+            issues = assessment.issues
+            if file_sig is not None:
+                self._tasks_cache[cache_key] = file_sig + (score, list(issues))
         
         print(f"Completion Score: {score:.2f}/10")
-        print(f"Issues: {assessment.issues}\n")
+        print(f"Issues: {issues}\n")
         
         # Tasks 文档不需要增强，只需要验证
         return EnhancementResult(
@@ -565,32 +473,90 @@ class UltraworkEnhancerV3:
             stopping_reason='validation_only',
             score_history=[score]
         )
+    
+    def batch_enhance_requirements(self, paths: Sequence[str],
+                                   max_workers: Optional[int] = None) -> List[EnhancementResult]:
+        """
+        批量增强多份互相独立的 Requirements 文档
+        
+        评估、识别、应用全程持有 GIL，线程池无法并行，因此使用进程池；
+        每个工作进程按本实例的配置各自创建增强器，缓存不在进程间共享。
+        文档少于 2 份或 max_workers == 1 时直接在当前进程内顺序处理
+        
+        Args:
+            paths: Requirements 文档路径列表
+            max_workers: 最大工作进程数（默认由 ProcessPoolExecutor 决定）
+        
+        Returns:
+            List[EnhancementResult]: 按输入顺序返回的增强结果
+        """
+        paths = list(paths)
+        if len(paths) < 2 or max_workers == 1:
+            return [self.enhance_requirements_quality(path) for path in paths]
+        
+        # 进程池模块导入较重（multiprocessing），只在真正并行时才加载
+        from concurrent.futures import ProcessPoolExecutor
+        
+        config = {
+            'quality_threshold': self.quality_threshold,
+            'max_iterations': self.max_iterations,
+            'plateau_iterations': self.plateau_iterations,
+            'min_score_improvement': self.min_score_improvement,
+            'create_backups': self.create_backups,
+            'cleanup_backups_on_success': self.cleanup_backups_on_success,
+            'verbose': self.verbose,
+        }
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_worker_enhancer,
+                                 initargs=(config,)) as executor:
+            return list(executor.map(_enhance_requirements_worker, paths))
+
+
+# ==================== 批量增强 ====================
+
+# 每个工作进程各自持有一个增强器，进程内的识别缓存可被后续文档复用
+_worker_enhancer = None
+
+
+def _init_worker_enhancer(config: dict):
+    """进程池初始化函数：按调用方的配置创建本进程的增强器"""
+    global _worker_enhancer
+    _worker_enhancer = UltraworkEnhancerV3(**config)
+
+
+def _enhance_requirements_worker(path: str) -> EnhancementResult:
+    """进程池工作函数：只接收文档路径"""
+    return _worker_enhancer.enhance_requirements_quality(path)
 
 
 def main():
     """命令行入口"""
-    import sys
+    # --quiet 可出现在任意位置，只关闭逐轮迭代的详细输出
+    quiet = '--quiet' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--quiet']
     
-    if len(sys.argv) < 3:
-        print("Usage: python ultrawork_enhancer_v3.py <command> <path> [requirements_path]")
+    if len(args) < 2:
+        print("Usage: python ultrawork_enhancer_v3.py <command> <path> [requirements_path] [--quiet]")
         print("Commands:")
         print("  requirements <path>              - Enhance requirements document")
         print("  design <path> <requirements>     - Enhance design document")
         print("  tasks <path>                     - Validate tasks document")
+        print("Options:")
+        print("  --quiet                          - Omit per-iteration progress")
         sys.exit(1)
     
-    command = sys.argv[1]
-    path = sys.argv[2]
+    command = args[0]
+    path = args[1]
     
-    enhancer = UltraworkEnhancerV3()
+    enhancer = UltraworkEnhancerV3(verbose=not quiet)
     
     if command == 'requirements':
         result = enhancer.enhance_requirements_quality(path)
     elif command == 'design':
-        if len(sys.argv) < 4:
+        if len(args) < 3:
             print("Error: design command requires requirements path")
             sys.exit(1)
-        requirements_path = sys.argv[3]
+        requirements_path = args[2]
         result = enhancer.enhance_design_completeness(path, requirements_path)
     elif command == 'tasks':
         result = enhancer.validate_tasks_completeness(path)
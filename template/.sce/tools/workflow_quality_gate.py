@@ -11,6 +11,10 @@ from pathlib import Path
 from quality_gate_enforcer import QualityGateEnforcer, GateResult
 
 
+# 报告中的分隔线
+_BAR = '=' * 60
+
+
 def main():
     """
     命令行入口 - 供 subagent 调用
@@ -69,9 +73,9 @@ def main():
             sys.exit(2)
         
         # 输出结果
-        print(f"\n{'='*60}")
+        print(f"\n{_BAR}")
         print(f"Quality Gate Result: {stage.upper()}")
-        print(f"{'='*60}")
+        print(_BAR)
         print(f"Status: {'PASSED ✓' if result.passed else 'FAILED ✗'}")
         print(f"Score: {result.score:.2f}/10")
         print(f"Threshold: {result.threshold}/10")
@@ -84,7 +88,7 @@ def main():
             print(f"  Iterations: {result.enhancement_result.iterations}")
             print(f"  Stopping Reason: {result.enhancement_result.stopping_reason}")
         
-        print(f"{'='*60}\n")
+        print(f"{_BAR}\n")
         
         # 返回退出码
         sys.exit(0 if result.passed else 1)